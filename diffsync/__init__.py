@@ -16,7 +16,24 @@ limitations under the License.
 """
 from collections import defaultdict
 from inspect import isclass
-from typing import Callable, ClassVar, Dict, List, Mapping, MutableMapping, Optional, Text, Tuple, Type, Union
+import sys
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    MutableSet,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+    Union,
+)
+import weakref
 
 from pydantic import BaseModel, PrivateAttr
 import structlog  # type: ignore
@@ -26,6 +43,12 @@ from .enum import DiffSyncModelFlags, DiffSyncFlags, DiffSyncStatus
 from .exceptions import DiffClassMismatch, ObjectAlreadyExists, ObjectStoreWrongType, ObjectNotFound
 from .helpers import DiffSyncDiffer, DiffSyncSyncer
 
+# Field value types that Pydantic's `dict()` converts or copies recursively, rather than returning as-is
+_NESTED_VALUE_TYPES = (BaseModel, dict, list, tuple, set, frozenset)
+
+# Sentinel for "no value", where None could be a legitimate value
+_MISSING = object()
+
 
 class DiffSyncModel(BaseModel):
     """Base class for all DiffSync object models.
@@ -75,9 +98,22 @@ class DiffSyncModel(BaseModel):
 
     When calculating a Diff or performing a sync, DiffSync will automatically recurse into these child models.
 
+    Each such field stores the unique ids of the child models, typically as a `List[str]`. For models with very many
+    children, a `Dict[str, None]` (which preserves insertion order) or a `Set[str]` may be used instead, making
+    `add_child()` and `remove_child()` constant-time rather than linear in the number of children.
+
     Note: inclusion in `_children` is mutually exclusive from inclusion in `_identifiers` or `_attributes`.
     """
 
+    # Set forms of the above, computed once at subclass declaration time for fast membership tests and lookups.
+    _identifiers_set: ClassVar[FrozenSet[str]] = frozenset()
+    _attributes_set: ClassVar[FrozenSet[str]] = frozenset()
+    _children_values_set: ClassVar[FrozenSet[str]] = frozenset()
+    # Fields whose reassignment changes the unique ID and/or the shortname of an instance
+    _identity_fields_set: ClassVar[FrozenSet[str]] = frozenset()
+    # Whether all of the above are actual fields, rather than properties, whose changes can't be tracked for caching
+    _identity_cacheable: ClassVar[bool] = True
+
     model_flags: DiffSyncModelFlags = DiffSyncModelFlags.NONE
     """Optional: any non-default behavioral flags for this DiffSyncModel.
 
@@ -93,11 +129,21 @@ class DiffSyncModel(BaseModel):
     _status_message: str = PrivateAttr("")
     """Message, if any, associated with the create/update/delete status value."""
 
+    _cached_uid: Optional[str] = PrivateAttr(None)
+    """Cached result of `get_unique_id()`, reset whenever any of the `_identifiers` fields is reassigned."""
+
+    _cached_identity: Optional[Tuple[Text, Text, Text, Mapping]] = PrivateAttr(None)
+    """Cached result of `_get_identity()`, reset whenever any of the `_identifiers` or `_shortname` fields is reassigned."""
+
     class Config:  # pylint: disable=too-few-public-methods
         """Pydantic class configuration."""
 
         # Let us have a DiffSync as an instance variable even though DiffSync is not a Pydantic model itself.
         arbitrary_types_allowed = True
+        # If a model instance is passed as the value of a field of another model, store it as-is rather than copying it;
+        # this avoids silently duplicating (potentially large numbers of) models. String values of this setting are
+        # only understood by Pydantic >= 1.9.2; older versions (where 1.9.0 and 1.9.1 expect a bool) still copy.
+        copy_on_model_validation = "none"
 
     def __init_subclass__(cls):
         """Validate that the various class attribute declarations correspond to actual instance fields.
@@ -119,16 +165,33 @@ class DiffSyncModel(BaseModel):
             if attr not in variables:
                 raise AttributeError(f"_children {cls._children} references missing or un-annotated attr {attr}")
 
+        # The modelname is used as a dict key on every store lookup; interning it lets those lookups match by identity.
+        # sys.intern() doesn't accept str subclasses, so those are left as-is
+        if type(cls._modelname) is str:  # pylint: disable=unidiomatic-typecheck
+            cls._modelname = sys.intern(cls._modelname)
+        cls._identifiers_set = frozenset(cls._identifiers)
+        cls._attributes_set = frozenset(cls._attributes)
+        cls._children_values_set = frozenset(cls._children.values())
+        cls._identity_fields_set = cls._identifiers_set | frozenset(cls._shortname)
+        cls._identity_cacheable = cls._identity_fields_set <= cls.__fields__.keys()
+
         # Any given field can only be in one of (_identifiers, _attributes, _children)
-        id_attr_overlap = set(cls._identifiers).intersection(cls._attributes)
+        id_attr_overlap = cls._identifiers_set & cls._attributes_set
         if id_attr_overlap:
-            raise AttributeError(f"Fields {id_attr_overlap} are included in both _identifiers and _attributes.")
-        id_child_overlap = set(cls._identifiers).intersection(cls._children.values())
+            raise AttributeError(f"Fields {set(id_attr_overlap)} are included in both _identifiers and _attributes.")
+        id_child_overlap = cls._identifiers_set & cls._children_values_set
         if id_child_overlap:
-            raise AttributeError(f"Fields {id_child_overlap} are included in both _identifiers and _children.")
-        attr_child_overlap = set(cls._attributes).intersection(cls._children.values())
+            raise AttributeError(f"Fields {set(id_child_overlap)} are included in both _identifiers and _children.")
+        attr_child_overlap = cls._attributes_set & cls._children_values_set
         if attr_child_overlap:
-            raise AttributeError(f"Fields {attr_child_overlap} are included in both _attributes and _children.")
+            raise AttributeError(f"Fields {set(attr_child_overlap)} are included in both _attributes and _children.")
+
+    def __setattr__(self, name, value):
+        """Set an attribute, invalidating the cached unique ID etc. if an identifier or shortname field is being changed."""
+        if name in self._identity_fields_set:
+            self._cached_uid = None
+            self._cached_identity = None
+        super().__setattr__(name, value)
 
     def __repr__(self):
         return f'{self.get_type()} "{self.get_unique_id()}"'
@@ -150,25 +213,52 @@ class DiffSyncModel(BaseModel):
             kwargs["exclude_defaults"] = True
         return super().json(**kwargs)
 
+    def copy(self, **kwargs) -> "DiffSyncModel":
+        """Copy this DiffSyncModel, making sure that the copy doesn't inherit a stale cached unique ID etc."""
+        model = super().copy(**kwargs)
+        if kwargs.get("update"):
+            model._cached_uid = None
+            model._cached_identity = None
+        return model
+
     def str(self, include_children: bool = True, indent: int = 0) -> str:
-        """Build a detailed string representation of this DiffSyncModel and optionally its children."""
-        margin = " " * indent
-        output = f"{margin}{self.get_type()}: {self.get_unique_id()}: {self.get_attrs()}"
-        for modelname, fieldname in self._children.items():
-            output += f"\n{margin}  {fieldname}"
-            child_ids = getattr(self, fieldname)
-            if not child_ids:
-                output += ": []"
-            elif not self.diffsync or not include_children:
-                output += f": {child_ids}"
-            else:
-                for child_id in child_ids:
-                    try:
-                        child = self.diffsync.get(modelname, child_id)
-                        output += "\n" + child.str(include_children=include_children, indent=indent + 4)
-                    except ObjectNotFound:
-                        output += f"\n{margin}    {child_id} (ERROR: details unavailable)"
-        return output
+        """Build a detailed string representation of this DiffSyncModel and optionally its children.
+
+        Child models are rendered without recursion, except that any child whose class overrides this method is
+        rendered by calling its own `str()`, so that such customizations apply wherever the model appears.
+        """
+        lines = []
+        # Walk the child models iteratively rather than recursively; the stack holds models (with their indentation)
+        # still to be rendered as well as literal lines still to be emitted, pushed in reverse so they pop in order.
+        stack: List[Union[str, Tuple["DiffSyncModel", int]]] = [(self, indent)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                lines.append(item)
+                continue
+            model, model_indent = item
+            margin = " " * model_indent
+            lines.append(f"{margin}{model.get_type()}: {model.get_unique_id()}: {model.get_attrs()}")
+            pending: List[Union[str, Tuple["DiffSyncModel", int]]] = []
+            for modelname, fieldname in model.get_children_mapping().items():
+                child_ids = getattr(model, fieldname)
+                if not child_ids:
+                    pending.append(f"{margin}  {fieldname}: []")
+                elif not model.diffsync or not include_children:
+                    pending.append(f"{margin}  {fieldname}: {child_ids}")
+                else:
+                    pending.append(f"{margin}  {fieldname}")
+                    for child_id in child_ids:
+                        child = model.diffsync._get_fast(modelname, child_id)  # pylint: disable=protected-access
+                        if child is None:
+                            pending.append(f"{margin}    {child_id} (ERROR: details unavailable)")
+                        elif type(child).str is not DiffSyncModel.str:
+                            # A subclass that customizes its own representation renders itself (and its children)
+                            pending.append(child.str(include_children=include_children, indent=model_indent + 4))
+                        else:
+                            pending.append((child, model_indent + 4))
+            stack.extend(reversed(pending))
+        return "\n".join(lines)
 
     def set_status(self, status: DiffSyncStatus, message: Text = ""):
         """Update the status (and optionally status message) of this model in response to a create/update/delete call."""
@@ -253,7 +343,11 @@ class DiffSyncModel(BaseModel):
         Args:
             **identifiers: Dict of identifiers and their values, as in `get_identifiers()`.
         """
-        return "__".join(str(identifiers[key]) for key in cls._identifiers)
+        if len(cls._identifiers) == 1:
+            # By far the most common case, for which there's nothing to join
+            return str(identifiers[cls._identifiers[0]])
+        # str.join() builds a list from its argument anyway, so passing it a list avoids a generator per call
+        return "__".join([str(identifiers[key]) for key in cls._identifiers])
 
     @classmethod
     def get_children_mapping(cls) -> Mapping[Text, Text]:
@@ -266,7 +360,7 @@ class DiffSyncModel(BaseModel):
         Returns:
             dict: dictionary containing all primary keys for this device, as defined in _identifiers
         """
-        return self.dict(include=set(self._identifiers))
+        return self._get_field_values(self._identifiers)
 
     def get_attrs(self) -> Mapping:
         """Get all the non-primary-key attributes or parameters for this object.
@@ -279,17 +373,50 @@ class DiffSyncModel(BaseModel):
         Returns:
             dict: Dictionary of attributes for this object
         """
-        return self.dict(include=set(self._attributes))
+        return self._get_field_values(self._attributes)
+
+    def _get_field_values(self, fieldnames: Tuple[str, ...]) -> dict:
+        """Get a dict of the given fields and their values, equivalent to `self.dict(include=...)` but much cheaper.
+
+        Plain values are read directly from the instance; only container or nested-model values are passed through
+        Pydantic's `dict()`, so that (as before) the caller gets a converted copy rather than a reference to our data.
+        """
+        values = {fieldname: getattr(self, fieldname) for fieldname in fieldnames}
+        nested = {fieldname for fieldname, value in values.items() if isinstance(value, _NESTED_VALUE_TYPES)}
+        if nested:
+            values.update(self.dict(include=nested))
+        return values
 
     def get_unique_id(self) -> Text:
         """Get the unique ID of an object.
 
         By default the unique ID is built based on all the primary keys defined in `_identifiers`.
 
+        The result is cached on the instance, as it is needed frequently (every time the object is stored, looked up,
+        diffed or synced) but only changes if one of the identifier fields is reassigned. It is not cached if any of
+        the `_identifiers` is a property rather than a field, as its value could then change at any time.
+
         Returns:
             str: Unique ID for this object
         """
-        return self.create_unique_id(**self.get_identifiers())
+        if self._cached_uid is None:
+            uid = self.create_unique_id(**self.get_identifiers())
+            if not self._identity_cacheable:
+                return uid
+            self._cached_uid = uid
+        return self._cached_uid
+
+    def _get_identity(self) -> Tuple[Text, Text, Text, Mapping]:
+        """Get the `(type, unique_id, shortname, identifiers)` of this object, as needed for every object being diffed.
+
+        The result is cached in the same way as for `get_unique_id()`; callers must not modify the identifiers dict.
+        """
+        if self._cached_identity is None:
+            identity = (self.get_type(), self.get_unique_id(), self.get_shortname(), self.get_identifiers())
+            if not self._identity_cacheable:
+                return identity
+            self._cached_identity = identity
+        return self._cached_identity
 
     def get_shortname(self) -> Text:
         """Get the (not guaranteed-unique) shortname of an object, if any.
@@ -319,18 +446,24 @@ class DiffSyncModel(BaseModel):
             ObjectAlreadyExists: if the unique id is already stored
         """
         child_type = child.get_type()
+        attr_name = self._children.get(child_type)
 
-        if child_type not in self._children:
+        if attr_name is None:
             raise ObjectStoreWrongType(
                 f"Unable to store {child_type} as a child of {self.get_type()}; "
                 f"valid types are {sorted(self._children.keys())}"
             )
 
-        attr_name = self._children[child_type]
+        child_uid = child.get_unique_id()
         childs = getattr(self, attr_name)
-        if child.get_unique_id() in childs:
-            raise ObjectAlreadyExists(f"Already storing a {child_type} with unique_id {child.get_unique_id()}", child)
-        childs.append(child.get_unique_id())
+        if child_uid in childs:
+            raise ObjectAlreadyExists(f"Already storing a {child_type} with unique_id {child_uid}", child)
+        if isinstance(childs, MutableMapping):
+            childs[child_uid] = None
+        elif isinstance(childs, MutableSet):
+            childs.add(child_uid)
+        else:
+            childs.append(child_uid)
 
     def remove_child(self, child: "DiffSyncModel"):
         """Remove a child reference from an object.
@@ -342,18 +475,22 @@ class DiffSyncModel(BaseModel):
             ObjectNotFound: if the child wasn't previously present.
         """
         child_type = child.get_type()
+        attr_name = self._children.get(child_type)
 
-        if child_type not in self._children:
+        if attr_name is None:
             raise ObjectStoreWrongType(
                 f"Unable to find and delete {child_type} as a child of {self.get_type()}; "
                 f"valid types are {sorted(self._children.keys())}"
             )
 
-        attr_name = self._children[child_type]
+        child_uid = child.get_unique_id()
         childs = getattr(self, attr_name)
-        if child.get_unique_id() not in childs:
+        if child_uid not in childs:
             raise ObjectNotFound(f"{child} was not found as a child in {attr_name}")
-        childs.remove(child.get_unique_id())
+        if isinstance(childs, MutableMapping):
+            del childs[child_uid]
+        else:
+            childs.remove(child_uid)
 
 
 class DiffSync:
@@ -373,6 +510,22 @@ class DiffSync:
     """Defaultdict storing model instances.
 
     `self._data[modelname][unique_id] == model_instance`
+
+    Read-only lookups should use `self._data.get(modelname, {})` so as not to add empty per-model entries.
+    """
+
+    _version: int
+    """Counter incremented on every change to the stored data, used to detect when a cached Diff is out of date.
+
+    Bumped by `add()`, `remove()` and `update_or_instantiate()`, as well as by `sync_from()`/`sync_to()` for each
+    model they create, update or delete in this instance. Changes made directly to the fields of stored models are
+    *not* detected.
+    """
+
+    _diff_cache: Optional[Tuple[Tuple, Diff]]
+    """Most recent `diff_from(..., use_cache=True)` result, along with the inputs and data versions it was based on.
+
+    The source DiffSync is only weakly referenced, so that caching a Diff doesn't keep it alive.
     """
 
     def __init__(self, name=None):
@@ -381,6 +534,8 @@ class DiffSync:
         Subclasses should be careful to call super().__init__() if they override this method.
         """
         self._data = defaultdict(dict)
+        self._version = 0
+        self._diff_cache = None
         self._log = structlog.get_logger().new(diffsync=self)
 
         # If the type is not defined, use the name of the class as the default value
@@ -438,18 +593,15 @@ class DiffSync:
     def str(self, indent: int = 0) -> str:
         """Build a detailed string representation of this DiffSync."""
         margin = " " * indent
-        output = ""
+        lines = []
         for modelname in self.top_level:
-            if output:
-                output += "\n"
-            output += f"{margin}{modelname}"
             models = self.get_all(modelname)
             if not models:
-                output += ": []"
+                lines.append(f"{margin}{modelname}: []")
             else:
-                for model in models:
-                    output += "\n" + model.str(indent=indent + 2)
-        return output
+                lines.append(f"{margin}{modelname}")
+                lines.extend(model.str(indent=indent + 2) for model in models)
+        return "\n".join(lines)
 
     # ------------------------------------------------------------------------------
     # Synchronization between DiffSync instances
@@ -462,6 +614,7 @@ class DiffSync:
         flags: DiffSyncFlags = DiffSyncFlags.NONE,
         callback: Optional[Callable[[Text, int, int], None]] = None,
         diff: Optional[Diff] = None,
+        parallel: int = 1,
     ):  # pylint: disable=too-many-arguments:
         """Synchronize data from the given source DiffSync object into the current DiffSync object.
 
@@ -472,6 +625,9 @@ class DiffSync:
             callback (function): Function with parameters (stage, current, total), to be called at intervals as the
                 calculation of the diff and subsequent sync proceed.
             diff (Diff): An existing diff to be used rather than generating a completely new diff.
+            parallel (int): If greater than 1, sync the subtrees under each top-level model concurrently, using up to
+                this many threads. The create/update/delete methods of this object's models must then be thread-safe.
+                Each `top_level` type is still only synced once all models of the preceding types have been.
         """
         if diff_class and diff:
             if not isinstance(diff, diff_class):
@@ -482,7 +638,9 @@ class DiffSync:
         # Generate the diff if an existing diff was not provided
         if not diff:
             diff = self.diff_from(source, diff_class=diff_class, flags=flags, callback=callback)
-        syncer = DiffSyncSyncer(diff=diff, src_diffsync=source, dst_diffsync=self, flags=flags, callback=callback)
+        syncer = DiffSyncSyncer(
+            diff=diff, src_diffsync=source, dst_diffsync=self, flags=flags, callback=callback, parallel=parallel
+        )
         result = syncer.perform_sync()
         if result:
             self.sync_complete(source, diff, flags, syncer.base_logger)
@@ -494,6 +652,7 @@ class DiffSync:
         flags: DiffSyncFlags = DiffSyncFlags.NONE,
         callback: Optional[Callable[[Text, int, int], None]] = None,
         diff: Optional[Diff] = None,
+        parallel: int = 1,
     ):  # pylint: disable=too-many-arguments
         """Synchronize data from the current DiffSync object into the given target DiffSync object.
 
@@ -504,8 +663,11 @@ class DiffSync:
             callback (function): Function with parameters (stage, current, total), to be called at intervals as the
                 calculation of the diff and subsequent sync proceed.
             diff (Diff): An existing diff that will be used when determining what needs to be synced.
+            parallel (int): If greater than 1, sync the subtrees under each top-level model concurrently, using up to
+                this many threads. The create/update/delete methods of the target's models must then be thread-safe.
+                Each `top_level` type is still only synced once all models of the preceding types have been.
         """
-        target.sync_from(self, diff_class=diff_class, flags=flags, callback=callback, diff=diff)
+        target.sync_from(self, diff_class=diff_class, flags=flags, callback=callback, diff=diff, parallel=parallel)
 
     def sync_complete(
         self,
@@ -539,7 +701,8 @@ class DiffSync:
         diff_class: Type[Diff] = Diff,
         flags: DiffSyncFlags = DiffSyncFlags.NONE,
         callback: Optional[Callable[[Text, int, int], None]] = None,
-    ) -> Diff:
+        use_cache: bool = False,
+    ) -> Diff:  # pylint: disable=too-many-arguments
         """Generate a Diff describing the difference from the other DiffSync to this one.
 
         Args:
@@ -548,11 +711,24 @@ class DiffSync:
             flags (DiffSyncFlags): Flags influencing the behavior of this diff operation.
             callback (function): Function with parameters (stage, current, total), to be called at intervals as the
                 calculation of the diff proceeds.
+            use_cache (bool): If True, and neither DiffSync has changed since the previous `use_cache=True` call with
+                the same source, diff_class and flags, return the same Diff as that call rather than recalculating it.
+                See `_version` for the kinds of changes that are detected.
         """
+        # A weak reference to the source (rather than its id(), which could be reused once it's garbage-collected)
+        # only compares equal to another reference to the same, still-existing, source
+        source_version = getattr(source, "_version", None)
+        cache_key = (weakref.ref(source), source_version, self._version, diff_class, flags)
+        if use_cache and self._diff_cache is not None and self._diff_cache[0] == cache_key:
+            return self._diff_cache[1]
+
         differ = DiffSyncDiffer(
             src_diffsync=source, dst_diffsync=self, flags=flags, diff_class=diff_class, callback=callback
         )
-        return differ.calculate_diffs()
+        diff = differ.calculate_diffs()
+        if use_cache and source_version is not None:
+            self._diff_cache = (cache_key, diff)
+        return diff
 
     def diff_to(
         self,
@@ -560,7 +736,8 @@ class DiffSync:
         diff_class: Type[Diff] = Diff,
         flags: DiffSyncFlags = DiffSyncFlags.NONE,
         callback: Optional[Callable[[Text, int, int], None]] = None,
-    ) -> Diff:
+        use_cache: bool = False,
+    ) -> Diff:  # pylint: disable=too-many-arguments
         """Generate a Diff describing the difference from this DiffSync to another one.
 
         Args:
@@ -569,8 +746,9 @@ class DiffSync:
             flags (DiffSyncFlags): Flags influencing the behavior of this diff operation.
             callback (function): Function with parameters (stage, current, total), to be called at intervals as the
                 calculation of the diff proceeds.
+            use_cache (bool): If True, reuse the previous Diff if nothing has changed since; see `diff_from()`.
         """
-        return target.diff_from(self, diff_class=diff_class, flags=flags, callback=callback)
+        return target.diff_from(self, diff_class=diff_class, flags=flags, callback=callback, use_cache=use_cache)
 
     # ------------------------------------------------------------------------------
     # Object Storage Management
@@ -609,9 +787,46 @@ class DiffSync:
                 f"either {obj} should be a class/instance or {identifier} should be a str"
             )
 
-        if uid not in self._data[modelname]:
+        model = self._data.get(modelname, {}).get(uid)
+        if model is None:
             raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
-        return self._data[modelname][uid]
+        return model
+
+    def _get_fast(self, modelname: Text, uid: Text) -> Optional[DiffSyncModel]:
+        """Get one object from the data store by its modelname and unique id, or None if it is not present.
+
+        Lightweight alternative to `get()` for internal callers that already have both the modelname and the uid,
+        avoiding its argument type checks as well as the cost of raising and catching ObjectNotFound for a miss.
+
+        If a subclass overrides `get()`, lookups are delegated to it instead, so that any custom behavior still applies.
+        """
+        if type(self).get is not DiffSync.get:
+            try:
+                return self.get(modelname, uid)
+            except ObjectNotFound:
+                return None
+        return self._data.get(modelname, {}).get(uid)
+
+    def _get_by_uids_fast(self, uids: Iterable[Text], modelname: Text) -> Dict[Text, DiffSyncModel]:
+        """Get multiple objects from the data store by their unique ids and modelname, as a dict keyed by unique id.
+
+        Lightweight alternative to `get_by_uids()` for internal callers that already have the modelname, sparing them
+        from having to recompute each object's unique id in order to index the returned objects.
+
+        If a subclass overrides `get_by_uids()`, lookups are delegated to it instead, so that any custom behavior
+        still applies.
+
+        Raises:
+            ObjectNotFound: if any of the requested UIDs are not found in the store
+        """
+        if type(self).get_by_uids is not DiffSync.get_by_uids:
+            uids = list(uids)
+            return dict(zip(uids, self.get_by_uids(uids, modelname)))
+        store = self._data.get(modelname, {})
+        try:
+            return {uid: store[uid] for uid in uids}
+        except KeyError as exc:
+            raise ObjectNotFound(f"{modelname} {exc.args[0]} not present in {self.name}") from None
 
     def get_all(self, obj: Union[Text, DiffSyncModel, Type[DiffSyncModel]]) -> List[DiffSyncModel]:
         """Get all objects of a given type.
@@ -627,7 +842,7 @@ class DiffSync:
         else:
             modelname = obj.get_type()
 
-        return list(self._data[modelname].values())
+        return list(self._data.get(modelname, {}).values())
 
     def get_by_uids(
         self, uids: List[Text], obj: Union[Text, DiffSyncModel, Type[DiffSyncModel]]
@@ -646,12 +861,11 @@ class DiffSync:
         else:
             modelname = obj.get_type()
 
-        results = []
-        for uid in uids:
-            if uid not in self._data[modelname]:
-                raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
-            results.append(self._data[modelname][uid])
-        return results
+        store = self._data.get(modelname, {})
+        try:
+            return [store[uid] for uid in uids]
+        except KeyError as exc:
+            raise ObjectNotFound(f"{modelname} {exc.args[0]} not present in {self.name}") from None
 
     def add(self, obj: DiffSyncModel):
         """Add a DiffSyncModel object to the store.
@@ -665,7 +879,8 @@ class DiffSync:
         modelname = obj.get_type()
         uid = obj.get_unique_id()
 
-        existing_obj = self._data[modelname].get(uid)
+        store = self._data[modelname]
+        existing_obj = store.get(uid)
         if existing_obj:
             if existing_obj is not obj:
                 raise ObjectAlreadyExists(f"Object {uid} already present", obj)
@@ -675,7 +890,8 @@ class DiffSync:
         if not obj.diffsync:
             obj.diffsync = self
 
-        self._data[modelname][uid] = obj
+        store[uid] = obj
+        self._version += 1
 
     def remove(self, obj: DiffSyncModel, remove_children: bool = False):
         """Remove a DiffSyncModel object from the store.
@@ -690,23 +906,23 @@ class DiffSync:
         modelname = obj.get_type()
         uid = obj.get_unique_id()
 
-        if uid not in self._data[modelname]:
+        if self._data.get(modelname, {}).pop(uid, _MISSING) is _MISSING:
             raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+        self._version += 1
 
         if obj.diffsync is self:
             obj.diffsync = None
 
-        del self._data[modelname][uid]
-
         if remove_children:
             for child_type, child_fieldname in obj.get_children_mapping().items():
+                child_store = self._data.get(child_type, {})
                 for child_id in getattr(obj, child_fieldname):
-                    try:
-                        child_obj = self.get(child_type, child_id)
-                        self.remove(child_obj, remove_children=remove_children)
-                    except ObjectNotFound:
-                        # Since this is "cleanup" code, log an error and continue, instead of letting the exception raise
+                    child_obj = child_store.get(child_id)
+                    if child_obj is None:
+                        # Since this is "cleanup" code, log an error and continue, instead of raising an exception
                         self._log.error(f"Unable to remove child {child_id} of {modelname} {uid} - not found!")
+                        continue
+                    self.remove(child_obj, remove_children=remove_children)
 
     def get_or_instantiate(
         self, model: Type[DiffSyncModel], ids: Dict, attrs: Dict = None
@@ -722,9 +938,8 @@ class DiffSync:
             Tuple[DiffSyncModel, bool]: Provides the existing or new object and whether it was created or not.
         """
         created = False
-        try:
-            obj = self.get(model, ids)
-        except ObjectNotFound:
+        obj = self._get_fast(model.get_type(), model.create_unique_id(**ids))
+        if obj is None:
             if not attrs:
                 attrs = {}
             obj = model(**ids, **attrs)
@@ -746,9 +961,8 @@ class DiffSync:
             Tuple[DiffSyncModel, bool]: Provides the existing or new object and whether it was created or not.
         """
         created = False
-        try:
-            obj = self.get(model, ids)
-        except ObjectNotFound:
+        obj = self._get_fast(model.get_type(), model.create_unique_id(**ids))
+        if obj is None:
             obj = model(**ids, **attrs)
             # Add the object to diffsync adapter
             self.add(obj)
@@ -758,6 +972,7 @@ class DiffSync:
         for attr, value in attrs.items():
             if getattr(obj, attr) != value:
                 setattr(obj, attr, value)
+                self._version += 1
 
         return obj, created
 
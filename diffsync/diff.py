@@ -15,30 +15,80 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from collections import defaultdict
 from functools import total_ordering
-from typing import Any, Iterator, Iterable, Mapping, Optional, Text, Type
+import sys
+from typing import (
+    Any,
+    ClassVar,
+    DefaultDict,
+    Dict,
+    Iterator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Text,
+    Tuple,
+    Type,
+    Union,
+)
 
 from .exceptions import ObjectAlreadyExists
-from .utils import intersection, OrderedDefaultDict
+from .utils import intersection
 
 
 class Diff:
     """Diff Object, designed to store multiple DiffElement object and organize them in a group."""
 
+    # Diffs are created in large numbers (one per DiffElement), so avoid a per-instance __dict__.
+    # Subclasses that don't declare __slots__ themselves will still get a __dict__ for any attributes of their own.
+    __slots__ = ("children",)
+
+    _order_method_names: ClassVar[Dict[Tuple[Type["Diff"], Text], Text]] = {}
+    """Cache, shared by all Diff classes, of the name of the order method each class uses for each group of children."""
+
     def __init__(self):
         """Initialize a new, empty Diff object."""
-        self.children = OrderedDefaultDict(dict)
-        """DefaultDict for storing DiffElement objects.
+        self.children: DefaultDict[Text, Dict[Text, "DiffElement"]] = defaultdict(dict)
+        """Defaultdict (of dicts, one per group, both in insertion order) for storing DiffElement objects.
 
         `self.children[group][unique_id] == DiffElement(...)`
         """
 
     def __len__(self):
         """Total number of DiffElements stored herein."""
-        total = 0
-        for child in self.get_children():
-            total += len(child)
-        return total
+        return sum(1 for _ in self._iter_all_elements())
+
+    def _iter_all_elements(self) -> Iterator["DiffElement"]:
+        """Iterate over all DiffElements stored herein, including all descendants of the direct children.
+
+        Each DiffElement is produced before any of its descendants, but otherwise in no particular order.
+        The tree is walked with an explicit stack rather than by recursion, so that very deep hierarchies can't
+        exceed the interpreter recursion limit; the other whole-tree methods of this class build on this.
+        """
+        stack = [self]
+        while stack:
+            diff = stack.pop()
+            for group in diff.children.values():
+                for element in group.values():
+                    yield element
+                    stack.append(element.child_diff)
+
+    def _elements_with_diffs(self) -> Set[int]:
+        """Get the `id()` of each DiffElement stored herein that has diffs itself or in any of its descendants.
+
+        This is calculated for the whole tree in a single pass, rather than by calling `has_diffs()` at every level.
+        """
+        with_diffs: Set[int] = set()
+        # Every DiffElement comes before its descendants in _iter_all_elements(), so in reverse it comes after them
+        for element in reversed(list(self._iter_all_elements())):
+            if element.has_diffs(include_children=False) or any(
+                id(child) in with_diffs for group in element.child_diff.children.values() for child in group.values()
+            ):
+                with_diffs.add(id(element))
+        return with_diffs
 
     def complete(self):
         """Method to call when this Diff has been fully populated with data and is "complete".
@@ -54,10 +104,11 @@ class Diff:
             ObjectAlreadyExists: if an element of the same type and same name is already stored.
         """
         # Note that element.name is usually a DiffSyncModel.shortname() -- i.e., NOT guaranteed globally unique!!
-        if element.name in self.children[element.type]:
+        group = self.children[element.type]
+        if element.name in group:
             raise ObjectAlreadyExists(f"Already storing a {element.type} named {element.name}", element)
 
-        self.children[element.type][element.name] = element
+        group[element.name] = element
 
     def groups(self):
         """Get the list of all group keys in self.children."""
@@ -69,11 +120,15 @@ class Diff:
         Returns:
             bool: True if at least one child element contains some diff
         """
-        for group in self.groups():
-            for child in self.children[group].values():
-                if child.has_diffs(include_children=True):
-                    return True
-
+        # Check each element for diffs of its own before descending further, so that this can return at the first diff
+        stack = [self]
+        while stack:
+            diff = stack.pop()
+            for group in diff.children.values():
+                for element in group.values():
+                    if element.has_diffs(include_children=False):
+                        return True
+                    stack.append(element.child_diff)
         return False
 
     def get_children(self) -> Iterator["DiffElement"]:
@@ -82,22 +137,24 @@ class Diff:
         For each group of children, check if an order method is defined,
         Otherwise use the default method.
         """
-        order_default = "order_children_default"
+        order_method_names = self._order_method_names
+        cls = type(self)
 
         for group in self.groups():
-            order_method_name = f"order_children_{group}"
-            if hasattr(self, order_method_name):
-                order_method = getattr(self, order_method_name)
-            else:
-                order_method = getattr(self, order_default)
+            order_method_name = order_method_names.get((cls, group))
+            if order_method_name is None:
+                order_method_name = f"order_children_{group}"
+                if not hasattr(cls, order_method_name):
+                    order_method_name = "order_children_default"
+                order_method_names[(cls, group)] = order_method_name
 
-            yield from order_method(self.children[group])
+            yield from getattr(self, order_method_name)(self.children[group])
 
     @classmethod
     def order_children_default(cls, children: Mapping) -> Iterator["DiffElement"]:
         """Default method to an Iterator for children.
 
-        Since children is already an OrderedDefaultDict, this method is not doing anything special.
+        Since children is already an insertion-ordered dict, this method is not doing anything special.
         """
         for child in children.values():
             yield child
@@ -110,42 +167,61 @@ class Diff:
             "delete": 0,
             "no-change": 0,
         }
-        for child in self.get_children():
-            child_summary = child.summary()
-            for key in summary:
-                summary[key] += child_summary[key]
+        for element in self._iter_all_elements():
+            summary[element.action or "no-change"] += 1
         return summary
 
     def str(self, indent: int = 0):
         """Build a detailed string representation of this Diff and its child DiffElements."""
-        margin = " " * indent
-        output = []
-        for group in self.groups():
-            group_heading_added = False
-            for child in self.children[group].values():
-                if child.has_diffs(include_children=True):
-                    if not group_heading_added:
-                        output.append(f"{margin}{group}")
-                        group_heading_added = True
-                    output.append(child.str(indent + 2))
-        result = "\n".join(output)
-        if not result:
-            result = "(no diffs)"
-        return result
+        lines: List[Text] = []
+        self.add_str_lines(lines, indent)
+        if not lines:
+            return "(no diffs)"
+        return "\n".join(lines)
+
+    def add_str_lines(self, lines: List[Text], indent: int = 0):
+        """Append the lines of the detailed string representation of this Diff and its children to `lines`.
+
+        Helper method for `str()`, so that the whole tree's output is joined together just once. Any descendant
+        Diff or DiffElement whose class overrides `str()` is rendered by calling its `str()`, so such overrides still
+        take effect; otherwise the tree is rendered without recursion.
+        """
+        _add_str_lines(lines, self, indent, self._elements_with_diffs())
 
     def dict(self) -> Mapping[Text, Mapping[Text, Mapping]]:
         """Build a dictionary representation of this Diff."""
-        result = OrderedDefaultDict(dict)
-        for child in self.get_children():
-            if child.has_diffs(include_children=True):
-                result[child.type][child.name] = child.dict()
-        return dict(result)
+        with_diffs = self._elements_with_diffs()
+        result: Dict[Text, Dict[Text, Mapping]] = {}
+        # Build the nested dicts top-down with an explicit stack; each element's own "-"/"+" diffs are added before
+        # its children's groups, just as DiffElement.dict() does
+        stack: List[Tuple[Diff, Dict]] = [(self, result)]
+        while stack:
+            diff, diff_result = stack.pop()
+            for child in diff.get_children():
+                if id(child) in with_diffs:
+                    child_result = child._attrs_diffs_dict()  # pylint: disable=protected-access
+                    diff_result.setdefault(child.type, {})[child.name] = child_result
+                    stack.append((child.child_diff, child_result))
+        return result
 
 
 @total_ordering
 class DiffElement:  # pylint: disable=too-many-instance-attributes
     """DiffElement object, designed to represent a single item/object that may or may not have any diffs."""
 
+    # As with Diff, there is one DiffElement per model being compared, so avoid a per-instance __dict__.
+    __slots__ = (
+        "type",
+        "name",
+        "keys",
+        "source_name",
+        "dest_name",
+        "source_attrs",
+        "dest_attrs",
+        "child_diff",
+        "_attrs_diffs",
+    )
+
     def __init__(
         self,
         obj_type: Text,
@@ -172,7 +248,9 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
         if not isinstance(name, str):
             raise ValueError(f"name must be a string (not {type(name)})")
 
-        self.type = obj_type
+        # Model types are few but DiffElements are many, so share one copy of each type string (as DiffSyncModel does);
+        # sys.intern() doesn't accept str subclasses, so those are left as-is
+        self.type = sys.intern(obj_type) if type(obj_type) is str else obj_type  # pylint: disable=unidiomatic-typecheck
         self.name = name
         self.keys = keys
         self.source_name = source_name
@@ -181,19 +259,26 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
         self.source_attrs: Optional[Mapping] = None
         self.dest_attrs: Optional[Mapping] = None
         self.child_diff = diff_class()
+        # Memoized result of get_attrs_diffs(), along with the source_attrs and dest_attrs it was calculated from
+        self._attrs_diffs: Optional[Tuple[Optional[Mapping], Optional[Mapping], Mapping]] = None
 
     def __lt__(self, other):
         """Logical ordering of DiffElements.
 
         Other comparison methods (__gt__, __le__, __ge__, etc.) are created by our use of the @total_ordering decorator.
         """
-        return (self.type, self.name) < (other.type, other.name)
+        # Equivalent to comparing (type, name) tuples, without building two tuples for every comparison while sorting
+        if self.type != other.type:
+            return self.type < other.type
+        return self.name < other.name
 
     def __eq__(self, other):
         """Logical equality of DiffElements.
 
         Other comparison methods (__gt__, __le__, __ge__, etc.) are created by our use of the @total_ordering decorator.
         """
+        if self is other:
+            return True
         if not isinstance(other, DiffElement):
             return NotImplemented
         return (
@@ -205,6 +290,14 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
             # TODO also check that self.child_diff == other.child_diff, needs Diff to implement __eq__().
         )
 
+    def __hash__(self):
+        """Hash of a DiffElement, consistent with __eq__() so that DiffElements can be used in sets and as dict keys.
+
+        Only the type and name are hashed; elements that are equal necessarily share both. Strings cache their own
+        hashes, so this isn't cached here, which keeps it correct even if either attribute is reassigned.
+        """
+        return hash((self.type, self.name))
+
     def __str__(self):
         """Basic string representation of a DiffElement."""
         return (
@@ -214,10 +307,7 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
 
     def __len__(self):
         """Total number of DiffElements in this one, including itself."""
-        total = 1  # self
-        for child in self.get_children():
-            total += len(child)
-        return total
+        return 1 + len(self.child_diff)
 
     @property
     def action(self) -> Optional[Text]:
@@ -226,16 +316,14 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
         Returns:
             str: "create", "update", "delete", or None
         """
-        if self.source_attrs is not None and self.dest_attrs is None:
-            return "create"
-        if self.source_attrs is None and self.dest_attrs is not None:
+        if self.source_attrs is not None:
+            if self.dest_attrs is None:
+                return "create"
+            # Reuse the (memoized) attribute diffs rather than comparing all of the shared attributes again
+            if self.get_attrs_diffs()["+"]:
+                return "update"
+        elif self.dest_attrs is not None:
             return "delete"
-        if (
-            self.source_attrs is not None
-            and self.dest_attrs is not None
-            and any(self.source_attrs[attr_key] != self.dest_attrs[attr_key] for attr_key in self.get_attrs_keys())
-        ):
-            return "update"
 
         return None
 
@@ -270,25 +358,38 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
         Returns:
             dict: of the form `{"-": {key1: <value>, key2: ...}, "+": {key1: <value>, key2: ...}}`,
             where the `"-"` or `"+"` dicts may be absent.
+
+        The result is calculated once and then reused for as long as `source_attrs` and `dest_attrs` are not replaced,
+        as it's needed repeatedly (during sync, logging, and rendering); callers must not modify it.
         """
-        if self.source_attrs is not None and self.dest_attrs is not None:
-            return {
-                "-": {
-                    key: self.dest_attrs[key]
-                    for key in self.get_attrs_keys()
-                    if self.source_attrs[key] != self.dest_attrs[key]
-                },
-                "+": {
-                    key: self.source_attrs[key]
-                    for key in self.get_attrs_keys()
-                    if self.source_attrs[key] != self.dest_attrs[key]
-                },
+        source_attrs, dest_attrs = self.source_attrs, self.dest_attrs
+        if (
+            self._attrs_diffs is not None
+            and self._attrs_diffs[0] is source_attrs
+            and self._attrs_diffs[1] is dest_attrs
+        ):
+            return self._attrs_diffs[2]
+
+        diffs: Mapping[Text, Mapping[Text, Any]]
+        if source_attrs is not None and dest_attrs is not None:
+            # Equivalent to checking each of get_attrs_keys() in turn, but in a single pass over the dest_attrs items
+            changed_dest_attrs = {
+                key: dest_value
+                for key, dest_value in dest_attrs.items()
+                if key in source_attrs and source_attrs[key] != dest_value
             }
-        if self.source_attrs is None and self.dest_attrs is not None:
-            return {"-": {key: self.dest_attrs[key] for key in self.get_attrs_keys()}}
-        if self.source_attrs is not None and self.dest_attrs is None:
-            return {"+": {key: self.source_attrs[key] for key in self.get_attrs_keys()}}
-        return {}
+            diffs = {
+                "-": changed_dest_attrs,
+                "+": {key: source_attrs[key] for key in changed_dest_attrs},
+            }
+        elif source_attrs is None and dest_attrs is not None:
+            diffs = {"-": dict(dest_attrs)}
+        elif source_attrs is not None and dest_attrs is None:
+            diffs = {"+": dict(source_attrs)}
+        else:
+            diffs = {}
+        self._attrs_diffs = (source_attrs, dest_attrs, diffs)
+        return diffs
 
     def add_child(self, element: "DiffElement"):
         """Attach a child object of type DiffElement.
@@ -310,14 +411,8 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
         Args:
           include_children: If True, recursively check children for diffs as well.
         """
-        if (self.source_attrs is not None and self.dest_attrs is None) or (
-            self.source_attrs is None and self.dest_attrs is not None
-        ):
+        if self.action is not None:
             return True
-        if self.source_attrs is not None and self.dest_attrs is not None:
-            for attr_key in self.get_attrs_keys():
-                if self.source_attrs.get(attr_key) != self.dest_attrs.get(attr_key):
-                    return True
 
         if include_children:
             if self.child_diff.has_diffs():
@@ -333,10 +428,7 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
             "delete": 0,
             "no-change": 0,
         }
-        if self.action:
-            summary[self.action] += 1
-        else:
-            summary["no-change"] += 1
+        summary[self.action or "no-change"] += 1
         child_summary = self.child_diff.summary()
         for key in summary:
             summary[key] += child_summary[key]
@@ -344,36 +436,97 @@ class DiffElement:  # pylint: disable=too-many-instance-attributes
 
     def str(self, indent: int = 0):
         """Build a detailed string representation of this DiffElement and its children."""
+        lines: List[Text] = []
+        self.add_str_lines(lines, indent)
+        return "\n".join(lines)
+
+    def add_str_lines(self, lines: List[Text], indent: int = 0):
+        """Append the lines of the detailed string representation of this DiffElement and its children to `lines`.
+
+        Helper method for `str()`, so that the whole tree's output is joined together just once. As in
+        `Diff.add_str_lines()`, any descendant whose class overrides `str()` is rendered by calling its `str()`.
+        """
+        _add_str_lines(lines, self, indent, self.child_diff._elements_with_diffs())  # pylint: disable=protected-access
+
+    def _add_own_str_lines(self, lines: List[Text], indent: int, child_has_diffs: bool):
+        """Append the lines of the detailed string representation of this DiffElement, without its children, to `lines`.
+
+        Helper method for `add_str_lines()`.
+        """
         margin = " " * indent
-        result = f"{margin}{self.type}: {self.name}"
+        heading = f"{margin}{self.type}: {self.name}"
         if self.source_attrs is not None and self.dest_attrs is not None:
+            lines.append(heading)
             # Only print attrs that have meaning in both source and dest
             attrs_diffs = self.get_attrs_diffs()
             for attr in attrs_diffs["+"]:
-                result += (
-                    f"\n{margin}  {attr}"
+                lines.append(
+                    f"{margin}  {attr}"
                     f"    {self.source_name}({attrs_diffs['+'][attr]})"
                     f"    {self.dest_name}({attrs_diffs['-'][attr]})"
                 )
         elif self.dest_attrs is not None:
-            result += f" MISSING in {self.source_name}"
+            lines.append(f"{heading} MISSING in {self.source_name}")
         elif self.source_attrs is not None:
-            result += f" MISSING in {self.dest_name}"
-
-        if self.child_diff.has_diffs():
-            result += "\n" + self.child_diff.str(indent + 2)
-        elif self.source_attrs is None and self.dest_attrs is None:
-            result += " (no diffs)"
-        return result
+            lines.append(f"{heading} MISSING in {self.dest_name}")
+        elif not child_has_diffs:
+            lines.append(f"{heading} (no diffs)")
+        else:
+            lines.append(heading)
 
-    def dict(self) -> Mapping[Text, Mapping[Text, Any]]:
-        """Build a dictionary representation of this DiffElement and its children."""
+    def _attrs_diffs_dict(self) -> Dict[Text, Any]:
+        """Build a dictionary representation of the attribute diffs of this DiffElement, without its children."""
         attrs_diffs = self.get_attrs_diffs()
         result = {}
         if "-" in attrs_diffs:
             result["-"] = attrs_diffs["-"]
         if "+" in attrs_diffs:
             result["+"] = attrs_diffs["+"]
+        return result
+
+    def dict(self) -> Mapping[Text, Mapping[Text, Any]]:
+        """Build a dictionary representation of this DiffElement and its children."""
+        result = self._attrs_diffs_dict()
         if self.child_diff.has_diffs():
             result.update(self.child_diff.dict())
         return result
+
+
+def _overrides_str(item: Union[Diff, DiffElement]) -> bool:
+    """Check whether the given Diff or DiffElement is of a subclass that overrides the base class's str() method."""
+    if isinstance(item, DiffElement):
+        return type(item).str is not DiffElement.str
+    return type(item).str is not Diff.str
+
+
+def _add_str_lines(lines: List[Text], root: Union[Diff, DiffElement], indent: int, with_diffs: Set[int]):
+    """Append the lines of the detailed string representation of the given Diff or DiffElement to `lines`.
+
+    Helper function for `Diff.add_str_lines()` and `DiffElement.add_str_lines()`, walking the tree below `root` with
+    an explicit stack rather than by recursion. `with_diffs` is as returned by `Diff._elements_with_diffs()`.
+    """
+    # Each stack entry is either a line of text (a group heading) or a Diff or DiffElement still to be rendered
+    stack: List[Tuple[Union[Text, Diff, DiffElement], int]] = [(root, indent)]
+    while stack:
+        item, indent = stack.pop()
+        if isinstance(item, str):
+            lines.append(item)
+        elif item is not root and _overrides_str(item):
+            # Subclasses may customize their own representation (and that of their children) by overriding str()
+            lines.append(item.str(indent))
+        elif isinstance(item, DiffElement):
+            child_has_diffs = any(
+                id(child) in with_diffs for group in item.child_diff.children.values() for child in group.values()
+            )
+            item._add_own_str_lines(lines, indent, child_has_diffs)  # pylint: disable=protected-access
+            if child_has_diffs:
+                stack.append((item.child_diff, indent + 2))
+        else:
+            margin = " " * indent
+            entries: List[Tuple[Union[Text, Diff, DiffElement], int]] = []
+            for group in item.groups():
+                children = [child for child in item.children[group].values() if id(child) in with_diffs]
+                if children:
+                    entries.append((f"{margin}{group}", indent))
+                    entries.extend((child, indent + 2) for child in children)
+            stack.extend(reversed(entries))
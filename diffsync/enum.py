@@ -65,6 +65,15 @@ class DiffSyncFlags(enum.Flag):
     This flag is off by default to reduce the default verbosity of DiffSync, but can be enabled when debugging.
     """
 
+    PARALLEL_TOPLEVEL = 0b10000
+    """If this flag is set, the diffs for each top-level model type are calculated concurrently, in separate threads.
+
+    No more threads are used than there are CPUs available, so this has no effect on a single-CPU system.
+
+    As diff calculation is largely CPU-bound Python code, whether this provides any speedup depends on the interpreter
+    (for example, a free-threaded build of CPython) and on the DiffSyncModel implementations involved.
+    """
+
 
 class DiffSyncStatus(enum.Enum):
     """Flag values to set as a DiffSyncModel's `_status` when performing a sync; values are logged by DiffSyncSyncer."""
@@ -15,19 +15,27 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 from collections.abc import Iterable as ABCIterable, Mapping as ABCMapping
-from typing import Callable, Iterable, List, Mapping, Optional, Tuple, Type, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from itertools import groupby
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union, TYPE_CHECKING
 
 import structlog  # type: ignore
 
 from .diff import Diff, DiffElement
 from .enum import DiffSyncModelFlags, DiffSyncFlags, DiffSyncStatus
-from .exceptions import ObjectNotFound, ObjectNotCreated, ObjectNotUpdated, ObjectNotDeleted, ObjectCrudException
+from .exceptions import ObjectNotCreated, ObjectNotUpdated, ObjectNotDeleted, ObjectCrudException
 from .utils import intersection, symmetric_difference
 
 if TYPE_CHECKING:  # pragma: no cover
     # For type annotation purposes, we have a circular import loop between __init__.py and this file.
     from . import DiffSync, DiffSyncModel  # pylint: disable=cyclic-import
 
+# DiffElements, along with the pair of DiffSyncModels they describe, whose children have yet to be diffed
+PendingChildren = List[Tuple[DiffElement, Optional["DiffSyncModel"], Optional["DiffSyncModel"]]]
+
 
 class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
     """Helper class implementing diff calculation logic for DiffSync.
@@ -47,22 +55,40 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
         self.src_diffsync = src_diffsync
         self.dst_diffsync = dst_diffsync
         self.flags = flags
+        # The flags are checked for every pair of models compared, so test them once up front
+        self.skip_unmatched_src = bool(flags & DiffSyncFlags.SKIP_UNMATCHED_SRC)
+        self.skip_unmatched_dst = bool(flags & DiffSyncFlags.SKIP_UNMATCHED_DST)
 
         self.logger = structlog.get_logger().new(src=src_diffsync, dst=dst_diffsync, flags=flags)
         self.diff_class = diff_class
         self.callback = callback
         self.diff: Optional[Diff] = None
 
+        # Children mappings common to each pair of (src, dst) model classes encountered, as computed by
+        # diff_child_objects(), along with the field names of the child types that only one or the other defines
+        self.children_mappings: Dict[Tuple[type, type], Tuple[Mapping[str, str], List[str], List[str]]] = {}
+
         self.models_processed = 0
         self.total_models = len(src_diffsync) + len(dst_diffsync)
+        # Only needed if PARALLEL_TOPLEVEL is set, to guard models_processed and children_mappings, which may then be
+        # updated from multiple threads
+        self.lock: Optional[threading.Lock] = threading.Lock() if flags & DiffSyncFlags.PARALLEL_TOPLEVEL else None
         self.logger.debug(f"Diff calculation between these two datasets will involve {self.total_models} models")
 
     def incr_models_processed(self, delta: int = 1):
         """Increment self.models_processed, then call self.callback if present."""
         if delta:
-            self.models_processed += delta
-            if self.callback:
-                self.callback("diff", self.models_processed, self.total_models)
+            if self.lock is None:
+                self._incr_models_processed(delta)
+            else:
+                with self.lock:
+                    self._incr_models_processed(delta)
+
+    def _incr_models_processed(self, delta: int):
+        """Helper method to `incr_models_processed`."""
+        self.models_processed += delta
+        if self.callback:
+            self.callback("diff", self.models_processed, self.total_models)
 
     def calculate_diffs(self) -> Diff:
         """Calculate diffs between the src and dst DiffSync objects and return the resulting Diff."""
@@ -83,12 +109,16 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
             elif skipped_type in self.src_diffsync.top_level:
                 self.incr_models_processed(len(self.src_diffsync.get_all(skipped_type)))
 
-        for obj_type in intersection(self.dst_diffsync.top_level, self.src_diffsync.top_level):
-            diff_elements = self.diff_object_list(
-                src=self.src_diffsync.get_all(obj_type),
-                dst=self.dst_diffsync.get_all(obj_type),
-            )
+        obj_types = intersection(self.dst_diffsync.top_level, self.src_diffsync.top_level)
+        max_workers = min(len(obj_types), os.cpu_count() or 1)
+        if self.lock is not None and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Results are returned in the order of obj_types, so the resulting Diff is the same as when sequential
+                diff_elements_by_type = list(executor.map(self.diff_top_level_type, obj_types))
+        else:
+            diff_elements_by_type = [self.diff_top_level_type(obj_type) for obj_type in obj_types]
 
+        for diff_elements in diff_elements_by_type:
             for diff_element in diff_elements:
                 self.diff.add(diff_element)
 
@@ -96,14 +126,34 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
         self.diff.complete()
         return self.diff
 
-    def diff_object_list(self, src: List["DiffSyncModel"], dst: List["DiffSyncModel"]) -> List[DiffElement]:
-        """Calculate diffs between two lists of like objects.
+    def diff_top_level_type(self, obj_type: str) -> List[DiffElement]:
+        """Calculate diffs between all objects of the given top-level type in the src and dst DiffSync objects.
 
         Helper method to `calculate_diffs`, usually doesn't need to be called directly.
+        """
+        return self.diff_object_list(src=self.src_diffsync.get_all(obj_type), dst=self.dst_diffsync.get_all(obj_type))
 
-        These helper methods work in a recursive cycle:
+    def diff_object_list(
+        self,
+        src: Union[List["DiffSyncModel"], Mapping[str, "DiffSyncModel"]],
+        dst: Union[List["DiffSyncModel"], Mapping[str, "DiffSyncModel"]],
+        pending: Optional[PendingChildren] = None,
+    ) -> List[DiffElement]:
+        """Calculate diffs between two lists (or dicts keyed by unique id) of like objects.
+
+        Helper method to `calculate_diffs`, usually doesn't need to be called directly.
+
+        These helper methods work in a cycle:
         diff_object_list -> diff_object_pair -> diff_child_objects -> diff_object_list -> etc.
+        Rather than recursing, each step appends the object pairs whose children remain to be diffed to `pending`;
+        if no `pending` list is given, these are all processed by `diff_pending_children` before returning.
         """
+        if pending is None:
+            pending = []
+            diff_elements = self.diff_object_list(src, dst, pending)
+            self.diff_pending_children(pending)
+            return diff_elements
+
         diff_elements = []
 
         if isinstance(src, ABCIterable) and isinstance(dst, ABCIterable):
@@ -111,23 +161,42 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
             dict_src = {item.get_unique_id(): item for item in src} if not isinstance(src, ABCMapping) else src
             dict_dst = {item.get_unique_id(): item for item in dst} if not isinstance(dst, ABCMapping) else dst
 
-            combined_dict = {}
-            for uid in dict_src:
-                combined_dict[uid] = (dict_src.get(uid), dict_dst.get(uid))
-            for uid in dict_dst:
-                combined_dict[uid] = (dict_src.get(uid), dict_dst.get(uid))
+            # Pair up the objects in a single pass over each dict, in source order followed by any destination-only
+            # objects (a set union of the keys would lose this ordering, which is reflected in the resulting Diff).
+            # Unmatched objects that diff_object_pair() would discard due to the SKIP_UNMATCHED_* flags are pruned
+            # here instead, so that neither they nor any of their children are ever visited.
+            dst_only = [dst_obj for uid, dst_obj in dict_dst.items() if uid not in dict_src]
+            pairs_count = len(dict_src) + len(dst_only)
+            if self.skip_unmatched_src:
+                object_pairs = []
+                for uid, src_obj in dict_src.items():
+                    dst_obj = dict_dst.get(uid)
+                    if dst_obj is None:
+                        self.logger.bind(model=src_obj.get_type(), unique_id=uid).debug(
+                            "Skipping unmatched source object"
+                        )
+                    else:
+                        object_pairs.append((src_obj, dst_obj))
+            else:
+                object_pairs = [(src_obj, dict_dst.get(uid)) for uid, src_obj in dict_src.items()]
+            if self.skip_unmatched_dst:
+                for dst_obj in dst_only:
+                    self.logger.bind(model=dst_obj.get_type(), unique_id=dst_obj.get_unique_id()).debug(
+                        "Skipping unmatched dest object"
+                    )
+            else:
+                object_pairs.extend((None, dst_obj) for dst_obj in dst_only)
         else:
             # In the future we might support set, etc...
             raise TypeError(f"Type combination {type(src)}/{type(dst)} is not supported... for now")
 
-        # Any non-intersection between src and dst can be counted as "processed" and done.
-        self.incr_models_processed(max(len(src) - len(combined_dict), 0) + max(len(dst) - len(combined_dict), 0))
-
-        self.validate_objects_for_diff(combined_dict.values())
+        # Any non-intersection between src and dst can be counted as "processed" and done, as can any pruned objects.
+        self.incr_models_processed(
+            max(len(src) - pairs_count, 0) + max(len(dst) - pairs_count, 0) + pairs_count - len(object_pairs)
+        )
 
-        for uid in combined_dict:
-            src_obj, dst_obj = combined_dict[uid]
-            diff_element = self.diff_object_pair(src_obj, dst_obj)
+        for src_obj, dst_obj in object_pairs:
+            diff_element = self.diff_object_pair(src_obj, dst_obj, pending)
 
             if diff_element:
                 diff_elements.append(diff_element)
@@ -148,58 +217,73 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
             # TODO: should we check/enforce whether all source models have the same DiffSync, whether all dest likewise?
             # TODO: should we check/enforce whether ALL DiffSyncModels in this dict have the same get_type() output?
             if src_obj and dst_obj:
-                if src_obj.get_type() != dst_obj.get_type():
-                    raise TypeError(f"Type mismatch: {src_obj.get_type()} vs {dst_obj.get_type()}")
-                if src_obj.get_shortname() != dst_obj.get_shortname():
-                    raise ValueError(f"Shortname mismatch: {src_obj.get_shortname()} vs {dst_obj.get_shortname()}")
-                if src_obj.get_identifiers() != dst_obj.get_identifiers():
-                    raise ValueError(f"Keys mismatch: {src_obj.get_identifiers()} vs {dst_obj.get_identifiers()}")
+                DiffSyncDiffer.validate_identities_for_diff(
+                    src_obj._get_identity(), dst_obj._get_identity()  # pylint: disable=protected-access
+                )
+
+    @staticmethod
+    def validate_identities_for_diff(src_identity: Tuple, dst_identity: Tuple):
+        """Check whether two DiffSyncModels, as described by their `_get_identity()` values, are valid to compare.
+
+        Helper method for `validate_objects_for_diff` and `diff_object_pair`.
+
+        Raises:
+            TypeError: If the objects have differing get_type() values.
+            ValueError: If the objects have differing get_shortname() or get_identifiers() values.
+        """
+        src_type, _, src_shortname, src_keys = src_identity
+        dst_type, _, dst_shortname, dst_keys = dst_identity
+        if src_type != dst_type:
+            raise TypeError(f"Type mismatch: {src_type} vs {dst_type}")
+        if src_shortname != dst_shortname:
+            raise ValueError(f"Shortname mismatch: {src_shortname} vs {dst_shortname}")
+        if src_keys != dst_keys:
+            raise ValueError(f"Keys mismatch: {src_keys} vs {dst_keys}")
 
     def diff_object_pair(
-        self, src_obj: Optional["DiffSyncModel"], dst_obj: Optional["DiffSyncModel"]
+        self,
+        src_obj: Optional["DiffSyncModel"],
+        dst_obj: Optional["DiffSyncModel"],
+        pending: Optional[PendingChildren] = None,
     ) -> Optional[DiffElement]:
         """Diff the two provided DiffSyncModel objects and return a DiffElement or None.
 
         Helper method to `calculate_diffs`, usually doesn't need to be called directly.
 
-        These helper methods work in a recursive cycle:
+        These helper methods work in a cycle:
         diff_object_list -> diff_object_pair -> diff_child_objects -> diff_object_list -> etc.
+        If a `pending` list is given, the children of the two objects are left to be diffed by the caller.
         """
         if src_obj:
-            model = src_obj.get_type()
-            unique_id = src_obj.get_unique_id()
-            shortname = src_obj.get_shortname()
-            keys = src_obj.get_identifiers()
+            identity = src_obj._get_identity()  # pylint: disable=protected-access
+            if dst_obj:
+                self.validate_identities_for_diff(identity, dst_obj._get_identity())  # pylint: disable=protected-access
+            model, unique_id, shortname, keys = identity
         elif dst_obj:
-            model = dst_obj.get_type()
-            unique_id = dst_obj.get_unique_id()
-            shortname = dst_obj.get_shortname()
-            keys = dst_obj.get_identifiers()
+            model, unique_id, shortname, keys = dst_obj._get_identity()  # pylint: disable=protected-access
         else:
             raise RuntimeError("diff_object_pair() called with neither src_obj nor dst_obj??")
 
-        log = self.logger.bind(model=model, unique_id=unique_id)
-        if self.flags & DiffSyncFlags.SKIP_UNMATCHED_SRC and not dst_obj:
-            log.debug("Skipping unmatched source object")
-            self.incr_models_processed()
-            return None
-        if self.flags & DiffSyncFlags.SKIP_UNMATCHED_DST and not src_obj:
-            log.debug("Skipping unmatched dest object")
-            self.incr_models_processed()
-            return None
-        if src_obj and src_obj.model_flags & DiffSyncModelFlags.IGNORE:
-            log.debug("Skipping due to IGNORE flag on source object")
-            self.incr_models_processed()
-            return None
-        if dst_obj and dst_obj.model_flags & DiffSyncModelFlags.IGNORE:
-            log.debug("Skipping due to IGNORE flag on dest object")
+        # The logger is only bound with the model details if there's something to log, as binding isn't free
+        skip_reason = None
+        if self.skip_unmatched_src and not dst_obj:
+            skip_reason = "Skipping unmatched source object"
+        elif self.skip_unmatched_dst and not src_obj:
+            skip_reason = "Skipping unmatched dest object"
+        elif src_obj and src_obj.model_flags & DiffSyncModelFlags.IGNORE:
+            skip_reason = "Skipping due to IGNORE flag on source object"
+        elif dst_obj and dst_obj.model_flags & DiffSyncModelFlags.IGNORE:
+            skip_reason = "Skipping due to IGNORE flag on dest object"
+        if skip_reason:
+            self.logger.bind(model=model, unique_id=unique_id).debug(skip_reason)
             self.incr_models_processed()
             return None
 
+        # The model's cached identifiers dict is copied, as the DiffElement may outlive (and be modified apart from) it
         diff_element = DiffElement(
             obj_type=model,
             name=shortname,
-            keys=keys,
+            keys=dict(keys),
             source_name=self.src_diffsync.name,
             dest_name=self.dst_diffsync.name,
             diff_class=self.diff_class,
@@ -215,38 +299,86 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
 
         self.incr_models_processed(delta)
 
-        # Recursively diff the children of src_obj and dst_obj and attach the resulting diffs to the diff_element
-        self.diff_child_objects(diff_element, src_obj, dst_obj)
+        # Diff the children of src_obj and dst_obj and attach the resulting diffs to the diff_element, either now or
+        # (without recursing) once the caller gets around to them
+        if pending is None:
+            self.diff_pending_children([(diff_element, src_obj, dst_obj)])
+        else:
+            pending.append((diff_element, src_obj, dst_obj))
 
         return diff_element
 
+    def diff_pending_children(self, pending: PendingChildren):
+        """Diff all children (and their descendants) of the given DiffSyncModel pairs, adding diffs to their DiffElements.
+
+        Helper method to `calculate_diffs`, usually doesn't need to be called directly.
+
+        This walks the entire tree below the given pairs, depth-first and in order, using an explicit stack rather than
+        recursion, so that deeply nested models cost no Python stack frames and can't hit the recursion limit.
+        """
+        stack = pending[::-1]
+        while stack:
+            diff_element, src_obj, dst_obj = stack.pop()
+            children_pending: PendingChildren = []
+            self.diff_child_objects(diff_element, src_obj, dst_obj, children_pending)
+            stack.extend(reversed(children_pending))
+
     def diff_child_objects(
         self,
         diff_element: DiffElement,
         src_obj: Optional["DiffSyncModel"],
         dst_obj: Optional["DiffSyncModel"],
+        pending: Optional[PendingChildren] = None,
     ):
         """For all children of the given DiffSyncModel pair, diff recursively, adding diffs to the given diff_element.
 
         Helper method to `calculate_diffs`, usually doesn't need to be called directly.
 
-        These helper methods work in a recursive cycle:
+        These helper methods work in a cycle:
         diff_object_list -> diff_object_pair -> diff_child_objects -> diff_object_list -> etc.
+        If a `pending` list is given, the grandchildren are left to be diffed by the caller.
         """
+        if pending is None:
+            pending = []
+            self.diff_child_objects(diff_element, src_obj, dst_obj, pending)
+            self.diff_pending_children(pending)
+            return diff_element
+
         children_mapping: Mapping[str, str]
         if src_obj and dst_obj:
-            # Get the subset of child types common to both src_obj and dst_obj
-            src_mapping = src_obj.get_children_mapping()
-            dst_mapping = dst_obj.get_children_mapping()
-            children_mapping = {}
-            for child_type, child_fieldname in src_mapping.items():
-                if child_type in dst_mapping:
-                    children_mapping[child_type] = child_fieldname
+            # Get the subset of child types common to both src_obj and dst_obj, which only depends on their classes
+            classes = (type(src_obj), type(dst_obj))
+            mappings = self.children_mappings.get(classes)
+            if mappings is None:
+                src_mapping = src_obj.get_children_mapping()
+                dst_mapping = dst_obj.get_children_mapping()
+                mappings = (
+                    {
+                        child_type: child_fieldname
+                        for child_type, child_fieldname in src_mapping.items()
+                        if child_type in dst_mapping
+                    },
+                    [
+                        child_fieldname
+                        for child_type, child_fieldname in src_mapping.items()
+                        if child_type not in dst_mapping
+                    ],
+                    [
+                        child_fieldname
+                        for child_type, child_fieldname in dst_mapping.items()
+                        if child_type not in src_mapping
+                    ],
+                )
+                if self.lock is None:
+                    self.children_mappings[classes] = mappings
                 else:
-                    self.incr_models_processed(len(getattr(src_obj, child_fieldname)))
-            for child_type, child_fieldname in dst_mapping.items():
-                if child_type not in src_mapping:
-                    self.incr_models_processed(len(getattr(dst_obj, child_fieldname)))
+                    with self.lock:
+                        mappings = self.children_mappings.setdefault(classes, mappings)
+            children_mapping, src_only_fieldnames, dst_only_fieldnames = mappings
+            for child_fieldname in src_only_fieldnames:
+                self.incr_models_processed(len(getattr(src_obj, child_fieldname)))
+            for child_fieldname in dst_only_fieldnames:
+                self.incr_models_processed(len(getattr(dst_obj, child_fieldname)))
         elif src_obj:
             children_mapping = src_obj.get_children_mapping()
         elif dst_obj:
@@ -258,11 +390,16 @@ class DiffSyncDiffer:  # pylint: disable=too-many-instance-attributes
             # for example, child_type == "device" and child_fieldname == "devices"
 
             # for example, getattr(src_obj, "devices") --> list of device uids
-            #          --> src_diffsync.get_by_uids(<list of device uids>, "device") --> list of device instances
-            src_objs = self.src_diffsync.get_by_uids(getattr(src_obj, child_fieldname), child_type) if src_obj else []
-            dst_objs = self.dst_diffsync.get_by_uids(getattr(dst_obj, child_fieldname), child_type) if dst_obj else []
+            #          --> src_diffsync._get_by_uids_fast(<list of device uids>, "device") --> dict of device instances
+            # pylint: disable=protected-access
+            src_objs = (
+                self.src_diffsync._get_by_uids_fast(getattr(src_obj, child_fieldname), child_type) if src_obj else {}
+            )
+            dst_objs = (
+                self.dst_diffsync._get_by_uids_fast(getattr(dst_obj, child_fieldname), child_type) if dst_obj else {}
+            )
 
-            for child_diff_element in self.diff_object_list(src=src_objs, dst=dst_objs):
+            for child_diff_element in self.diff_object_list(src=src_objs, dst=dst_objs, pending=pending):
                 diff_element.add_child(child_diff_element)
 
         return diff_element
@@ -281,12 +418,14 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
         dst_diffsync: "DiffSync",
         flags: DiffSyncFlags,
         callback: Optional[Callable[[str, int, int], None]] = None,
+        parallel: int = 1,
     ):
         """Create a DiffSyncSyncer instance, ready to call `perform_sync()` against."""
         self.diff = diff
         self.dst_diffsync = dst_diffsync
         self.flags = flags
         self.callback = callback
+        self.parallel = parallel
 
         self.elements_processed = 0
         self.total_elements = len(diff)
@@ -294,65 +433,201 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
         self.base_logger = structlog.get_logger().new(src=src_diffsync, dst=dst_diffsync, flags=flags)
 
         # Local state maintained during synchronization
-        self.logger: structlog.BoundLogger = self.base_logger
+        self._logger: Optional[structlog.BoundLogger] = self.base_logger
+        self._log_context: Mapping = {}
         self.model_class: Type["DiffSyncModel"]
         self.action: Optional[str] = None
 
+        # Only needed in case of a parallel sync, to serialize updates to the dst_diffsync store and to our progress
+        self.lock: Optional[threading.Lock] = threading.Lock() if parallel > 1 else None
+        # In case of a parallel sync, each thread works on its own copy of this syncer (see `perform_sync`),
+        # which reports its progress back to the original syncer
+        self._parent: Optional["DiffSyncSyncer"] = None
+
+        self._bind_action_handlers()
+
+    def _bind_action_handlers(self):
+        """Resolve the handler for each possible DiffElement action once here, rather than per element in `sync_model`."""
+        self.action_handlers: Mapping[
+            str, Callable[[Optional["DiffSyncModel"], Mapping, Mapping], Optional["DiffSyncModel"]]
+        ] = {
+            "create": self.create_model,
+            "update": self.update_model,
+            "delete": self.delete_model,
+        }
+
+    @property
+    def logger(self) -> structlog.BoundLogger:
+        """Logger bound to the context of the DiffElement currently being synchronized.
+
+        The binding is done lazily on first use, as most elements (those with no changes) don't log anything at all.
+        """
+        if self._logger is None:
+            self._logger = self.base_logger.bind(**self._log_context)
+        return self._logger
+
+    @logger.setter
+    def logger(self, value: structlog.BoundLogger):
+        self._logger = value
+
     def incr_elements_processed(self, delta: int = 1):
         """Increment self.elements_processed, then call self.callback if present."""
-        if delta:
-            self.elements_processed += delta
-            if self.callback:
-                self.callback("sync", self.elements_processed, self.total_elements)
+        if self._parent is not None:
+            self._parent.incr_elements_processed(delta)
+        elif delta:
+            if self.lock is None:
+                self._incr_elements_processed(delta)
+            else:
+                with self.lock:
+                    self._incr_elements_processed(delta)
+
+    def _incr_elements_processed(self, delta: int):
+        """Helper method to `incr_elements_processed`."""
+        self.elements_processed += delta
+        if self.callback:
+            self.callback("sync", self.elements_processed, self.total_elements)
+
+    def _make_worker(self) -> "DiffSyncSyncer":
+        """Create a copy of this syncer, with its own local state, for use by a single thread of a parallel sync."""
+        worker = copy.copy(self)
+        worker._parent = self  # pylint: disable=protected-access
+        worker._bind_action_handlers()  # pylint: disable=protected-access
+        return worker
+
+    def _sync_diff_element_in_worker(self, element: DiffElement) -> bool:
+        """Synchronize the given top-level DiffElement and its children using a new worker copy of this syncer.
+
+        Helper method to `perform_sync`.
+        """
+        return self._make_worker().sync_diff_element(element)
 
     def perform_sync(self) -> bool:
         """Perform data synchronization based on the provided diff.
 
+        If `self.parallel` is greater than 1, the subtrees under each top-level DiffElement of a given type are
+        synchronized concurrently by up to that many threads; this can help hide the latency of DiffSyncModel
+        create/update/delete implementations that talk to remote systems, but requires those implementations to be
+        thread-safe. Top-level types are still synchronized one after another, in `top_level` order, so that models
+        of one type can rely on any models of an earlier type that they refer to having already been synchronized.
+
         Returns:
             bool: True if any changes were actually performed, else False.
         """
-        changed = False
         self.base_logger.info("Beginning sync")
-        for element in self.diff.get_children():
-            changed |= self.sync_diff_element(element)
+        changed = False
+        if self.parallel > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+                for _, group in groupby(self.diff.get_children(), key=lambda element: element.type):
+                    # Consume all results (rather than short-circuiting) so that any exception is always re-raised
+                    # here, and before moving on to the next top-level type
+                    changed |= any(list(executor.map(self._sync_diff_element_in_worker, group)))
+        else:
+            for element in self.diff.get_children():
+                changed |= self.sync_diff_element(element)
         self.base_logger.info("Sync complete")
         return changed
 
     def sync_diff_element(self, element: DiffElement, parent_model: "DiffSyncModel" = None) -> bool:
-        """Recursively synchronize the given DiffElement and its children, if any, into the dst_diffsync.
+        """Synchronize the given DiffElement and its children, if any, into the dst_diffsync.
 
         Helper method to `perform_sync`.
 
         Returns:
             bool: True if this element or any of its children resulted in actual changes, else False.
         """
-        self.model_class = getattr(self.dst_diffsync, element.type)
-        diffs = element.get_attrs_diffs()
-        self.logger = self.base_logger.bind(
-            action=element.action,
-            model=element.type,
-            unique_id=self.model_class.create_unique_id(**element.keys),
-            diffs=diffs,
-        )
-        self.action = element.action
-        ids = element.keys
-        # We only actually need the "new" attrs to perform a create/update operation, and don't need any for a delete
-        attrs = diffs.get("+", {})
+        return self.sync_diff_subtree(element, parent_model=parent_model)
 
-        model: Optional["DiffSyncModel"]
-        try:
-            model = self.dst_diffsync.get(self.model_class, ids)
+    def sync_diff_subtree(self, element: DiffElement, parent_model: "DiffSyncModel" = None) -> bool:
+        """Synchronize the given DiffElement and all of its descendants into the dst_diffsync.
+
+        Helper method to `sync_diff_element`.
+
+        Returns:
+            bool: True if any changes were actually performed, else False.
+        """
+        changed = False
+        # Walk the diff tree with an explicit stack rather than by recursion, so that deep model hierarchies
+        # don't run into the interpreter recursion limit. Children are pushed in reverse so that they are
+        # popped (and therefore synced) in the same depth-first, parent-before-children order as before.
+        stack: List[Tuple[DiffElement, Optional["DiffSyncModel"]]] = [(element, parent_model)]
+        while stack:
+            element, parent_model = stack.pop()
+            element_changed, model = self._sync_single_element(element, parent_model=parent_model)
+            changed |= element_changed
+            if model is not None:
+                stack.extend((child, model) for child in reversed(list(element.get_children())))
+        return changed
+
+    def _sync_single_element(
+        self, element: DiffElement, parent_model: "DiffSyncModel" = None
+    ) -> Tuple[bool, Optional["DiffSyncModel"]]:
+        """Synchronize the given DiffElement (but not its children) into the dst_diffsync.
+
+        Helper method to `sync_diff_subtree`.
+
+        Returns:
+            tuple: (changed, model) where changed is True if this element resulted in actual changes, and model is
+            the DiffSyncModel under which the children of this element should be synced, or None if they should be
+            skipped.
+        """
+        modelname = element.type
+        ids = element.keys
+        self.action = element.action
+        self.model_class = getattr(self.dst_diffsync, modelname)
+        diffs = element.get_attrs_diffs()
+        uid = self.model_class.create_unique_id(**ids)
+        self._log_context = {"action": self.action, "model": modelname, "unique_id": uid, "diffs": diffs}
+        self._logger = None
+        # We only actually need the "new" attrs to perform a create/update operation, and don't need any for a delete.
+        # Copy them, as the diffs are cached on the element, and create()/update() implementations may modify attrs.
+        attrs = dict(diffs.get("+", {}))
+
+        model = self.dst_diffsync._get_fast(self.model_class.get_type(), uid)  # pylint: disable=protected-access
+        if model is not None:
             model.set_status(DiffSyncStatus.UNKNOWN)
-        except ObjectNotFound:
-            model = None
 
         changed, modified_model = self.sync_model(model, ids, attrs)
         model = modified_model or model
+        if changed:
+            self._record_dst_change()
 
         if not modified_model or not model:
             self.logger.warning("No object resulted from sync, will not process child objects.")
-            return changed
+            return (changed, None)
+
+        if self.lock is None:
+            process_children = self._update_dst_store(model, parent_model)
+        else:
+            with self.lock:
+                process_children = self._update_dst_store(model, parent_model)
+        if not process_children:
+            return (changed, None)
+
+        self.incr_elements_processed()
+
+        return (changed, model)
+
+    def _record_dst_change(self):
+        """Bump the data version of the dst_diffsync, so that any Diff it has cached in `diff_from()` is discarded.
+
+        Helper method to `_sync_single_element`.
+        """
+        if getattr(self.dst_diffsync, "_version", None) is None:
+            return
+        if self.lock is None:
+            self.dst_diffsync._version += 1  # pylint: disable=protected-access
+        else:
+            with self.lock:
+                self.dst_diffsync._version += 1  # pylint: disable=protected-access
 
+    def _update_dst_store(self, model: "DiffSyncModel", parent_model: Optional["DiffSyncModel"]) -> bool:
+        """Add the given newly created model to, or remove the given deleted model from, the dst_diffsync.
+
+        Helper method to `_sync_single_element`.
+
+        Returns:
+            bool: True if the children of the model still need to be synchronized, else False.
+        """
         if self.action == "create":
             if parent_model:
                 parent_model.add_child(model)
@@ -363,22 +638,16 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
             if model.model_flags & DiffSyncModelFlags.SKIP_CHILDREN_ON_DELETE:
                 # We don't need to process the child objects, but we do need to discard them from the dst_diffsync
                 self.dst_diffsync.remove(model, remove_children=True)
-                return changed
+                return False
             self.dst_diffsync.remove(model)
-
-        self.incr_elements_processed()
-
-        for child in element.get_children():
-            changed |= self.sync_diff_element(child, parent_model=model)
-
-        return changed
+        return True
 
     def sync_model(
         self, model: Optional["DiffSyncModel"], ids: Mapping, attrs: Mapping
     ) -> Tuple[bool, Optional["DiffSyncModel"]]:
         """Create/update/delete the current DiffSyncModel with current ids/attrs, and update self.status and self.message.
 
-        Helper method to `sync_diff_element`.
+        Helper method to `_sync_single_element`.
 
         Returns:
             tuple: (changed, model) where model may be None if an error occurred
@@ -391,20 +660,10 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
 
         try:
             self.logger.debug(f"Attempting model {self.action}")
-            if self.action == "create":
-                if model is not None:
-                    raise ObjectNotCreated(f"Failed to create {self.model_class.get_type()} {ids} - it already exists!")
-                model = self.model_class.create(diffsync=self.dst_diffsync, ids=ids, attrs=attrs)
-            elif self.action == "update":
-                if model is None:
-                    raise ObjectNotUpdated(f"Failed to update {self.model_class.get_type()} {ids} - not found!")
-                model = model.update(attrs=attrs)
-            elif self.action == "delete":
-                if model is None:
-                    raise ObjectNotDeleted(f"Failed to delete {self.model_class.get_type()} {ids} - not found!")
-                model = model.delete()
-            else:
+            handler = self.action_handlers.get(self.action)
+            if handler is None:
                 raise ObjectCrudException(f'Unknown action "{self.action}"!')
+            model = handler(model, ids, attrs)
 
             if model is not None:
                 status, message = model.get_status()
@@ -424,6 +683,26 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
 
         return (True, model)
 
+    def create_model(self, model: Optional["DiffSyncModel"], ids: Mapping, attrs: Mapping) -> Optional["DiffSyncModel"]:
+        """Create a new instance of the current DiffSyncModel class. Helper method to `sync_model`."""
+        if model is not None:
+            raise ObjectNotCreated(f"Failed to create {self.model_class.get_type()} {ids} - it already exists!")
+        return self.model_class.create(diffsync=self.dst_diffsync, ids=ids, attrs=attrs)
+
+    def update_model(self, model: Optional["DiffSyncModel"], ids: Mapping, attrs: Mapping) -> Optional["DiffSyncModel"]:
+        """Update the given existing DiffSyncModel instance. Helper method to `sync_model`."""
+        if model is None:
+            raise ObjectNotUpdated(f"Failed to update {self.model_class.get_type()} {ids} - not found!")
+        return model.update(attrs=attrs)
+
+    def delete_model(
+        self, model: Optional["DiffSyncModel"], ids: Mapping, attrs: Mapping  # pylint: disable=unused-argument
+    ) -> Optional["DiffSyncModel"]:
+        """Delete the given existing DiffSyncModel instance. Helper method to `sync_model`."""
+        if model is None:
+            raise ObjectNotDeleted(f"Failed to delete {self.model_class.get_type()} {ids} - not found!")
+        return model.delete()
+
     def log_sync_status(self, action: Optional[str], status: DiffSyncStatus, message: str):
         """Log the current sync status at the appropriate verbosity with appropriate context.
 
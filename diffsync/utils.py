@@ -16,13 +16,15 @@ limitations under the License.
 """
 
 from collections import OrderedDict
+from collections.abc import Set
 from typing import List
 
 
 def intersection(lst1, lst2) -> List:
     """Calculate the intersection of two lists, with ordering based on the first list."""
-    lst3 = [value for value in lst1 if value in lst2]
-    return lst3
+    # Test membership against a set (dict key views already are one) rather than scanning lst2 for every value
+    members = lst2 if isinstance(lst2, Set) else set(lst2)
+    return [value for value in lst1 if value in members]
 
 
 def symmetric_difference(lst1, lst2) -> List:
@@ -14,7 +14,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from typing import ClassVar, List, Mapping, Optional, Tuple
+from typing import ClassVar, Dict, List, Mapping, Optional, Tuple
 
 import pytest
 
@@ -29,38 +29,50 @@ def generic_diffsync_model():
     return DiffSyncModel()
 
 
+@pytest.fixture(scope="session")
+def generic_diffsync_model_ro():
+    """Provide a generic DiffSyncModel instance shared between tests, which therefore must not modify it."""
+    return DiffSyncModel()
+
+
 class ErrorProneModelMixin:
-    """Test class that sometimes throws exceptions when creating/updating/deleting instances."""
+    """Test class that sometimes throws exceptions when creating/updating/deleting instances.
+
+    The operations attempted on each model class are counted by its ErrorProneBackendA, so that models in different
+    DiffSync instances (and hence in different tests) don't affect one another.
+    """
 
-    _counter: ClassVar[int] = 0
+    @classmethod
+    def count_operation(cls, diffsync: "ErrorProneBackendA") -> int:
+        """Count an operation on this model class within the given DiffSync, returning the new count."""
+        diffsync.operation_counts[cls] = diffsync.operation_counts.get(cls, 0) + 1
+        return diffsync.operation_counts[cls]
 
     @classmethod
     def create(cls, diffsync: DiffSync, ids: Mapping, attrs: Mapping):
         """As DiffSyncModel.create(), but periodically throw exceptions."""
-        cls._counter += 1
-        if not cls._counter % 5:
+        count = cls.count_operation(diffsync)  # type: ignore
+        if not count % 5:
             raise ObjectNotCreated("Random creation error!")
-        if not cls._counter % 4:
+        if not count % 4:
             return None  # non-fatal error
         return super().create(diffsync, ids, attrs)  # type: ignore
 
     def update(self, attrs: Mapping):
         """As DiffSyncModel.update(), but periodically throw exceptions."""
-        # pylint: disable=protected-access
-        self.__class__._counter += 1
-        if not self.__class__._counter % 5:
+        count = self.count_operation(self.diffsync)  # type: ignore
+        if not count % 5:
             raise ObjectNotUpdated("Random update error!")
-        if not self.__class__._counter % 4:
+        if not count % 4:
             return None  # non-fatal error
         return super().update(attrs)  # type: ignore
 
     def delete(self):
         """As DiffSyncModel.delete(), but periodically throw exceptions."""
-        # pylint: disable=protected-access
-        self.__class__._counter += 1
-        if not self.__class__._counter % 5:
+        count = self.count_operation(self.diffsync)  # type: ignore
+        if not count % 5:
             raise ObjectNotDeleted("Random deletion error!")
-        if not self.__class__._counter % 4:
+        if not count % 4:
             return None  # non-fatal error
         return super().delete()  # type: ignore
 
@@ -146,6 +158,12 @@ def generic_diffsync():
     return DiffSync()
 
 
+@pytest.fixture(scope="session")
+def generic_diffsync_ro():
+    """Provide a generic DiffSync instance shared between tests, which therefore must not modify it."""
+    return DiffSync()
+
+
 class UnusedModel(DiffSyncModel):
     """Concrete DiffSyncModel subclass that can be referenced as a class attribute but never has any data."""
 
@@ -239,19 +257,50 @@ class BackendA(GenericBackend):
         self.get("site", "rdu").add_child(person)
 
 
-@pytest.fixture
-def backend_a():
-    """Provide an instance of BackendA subclass of DiffSync."""
+# Loaded backends are provided to tests as clones of session-scoped templates, which must never be modified; tests
+# that only read from a backend can use the template itself via the corresponding `_ro` fixture. The templates hold
+# no state other than their models (the ErrorProne models count their operations on each clone, not on the class),
+# so tests can also safely be distributed across processes with pytest-xdist (`pytest -n auto`), in which case each
+# worker simply builds its own templates.
+def clone_backend(template: DiffSync) -> DiffSync:
+    """Make a copy of the given loaded DiffSync, whose models can be modified without affecting the template.
+
+    This is considerably cheaper than either loading a fresh instance or using copy.deepcopy().
+    """
+    # pylint: disable=protected-access
+    clone = template.__class__(name=template.name)
+    for store in template._data.values():
+        for model in store.values():
+            # Child lists are the only mutable fields of the test models, so are the only ones that need copying
+            update = {fieldname: list(getattr(model, fieldname)) for fieldname in model._children.values()}
+            clone.add(model.copy(update={**update, "diffsync": None}))
+    return clone
+
+
+@pytest.fixture(scope="session")
+def _backend_a_template():
+    """Provide a loaded BackendA, shared by all tests; use the `backend_a` fixture for a copy that can be modified."""
     diffsync = BackendA()
     diffsync.load()
     return diffsync
 
 
 @pytest.fixture
-def backend_a_with_extra_models():
+def backend_a(_backend_a_template):
+    """Provide an instance of BackendA subclass of DiffSync."""
+    return clone_backend(_backend_a_template)
+
+
+@pytest.fixture(scope="session")
+def backend_a_ro(_backend_a_template):
+    """Provide a loaded BackendA shared between tests, which therefore must not modify it."""
+    return _backend_a_template
+
+
+@pytest.fixture
+def backend_a_with_extra_models(_backend_a_template):
     """Provide an instance of BackendA subclass of DiffSync with some extra sites and devices."""
-    extra_models = BackendA()
-    extra_models.load()
+    extra_models = clone_backend(_backend_a_template)
     extra_site = extra_models.site(name="lax")
     extra_models.add(extra_site)
     extra_device = extra_models.device(name="nyc-spine3", site_name="nyc", role="spine")
@@ -261,10 +310,9 @@ def backend_a_with_extra_models():
 
 
 @pytest.fixture
-def backend_a_minus_some_models():
+def backend_a_minus_some_models(_backend_a_template):
     """Provide an instance of BackendA subclass of DiffSync with fewer models than the default."""
-    missing_models = BackendA()
-    missing_models.load()
+    missing_models = clone_backend(_backend_a_template)
     missing_models.remove(missing_models.get(missing_models.site, "rdu"))
     missing_device = missing_models.get(missing_models.device, "sfo-spine2")
     missing_models.get(missing_models.site, "sfo").remove_child(missing_device)
@@ -291,15 +339,26 @@ class ErrorProneBackendA(BackendA):
     device = ErrorProneDeviceA
     interface = ErrorProneInterface
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the count of operations attempted on each of the ErrorProne model classes."""
+        super().__init__(*args, **kwargs)
+        self.operation_counts: Dict[type, int] = {}
 
-@pytest.fixture
-def error_prone_backend_a():
-    """Provide an instance of ErrorProneBackendA subclass of DiffSync."""
+
+@pytest.fixture(scope="session")
+def _error_prone_backend_a_template():
+    """Provide a loaded ErrorProneBackendA, shared by all tests; use the `error_prone_backend_a` fixture instead."""
     diffsync = ErrorProneBackendA()
     diffsync.load()
     return diffsync
 
 
+@pytest.fixture
+def error_prone_backend_a(_error_prone_backend_a_template):
+    """Provide an instance of ErrorProneBackendA subclass of DiffSync."""
+    return clone_backend(_error_prone_backend_a_template)
+
+
 class SiteB(Site):
     """Extend Site with a `places` list."""
 
@@ -357,18 +416,35 @@ class BackendB(GenericBackend):
         self.get("site", "nyc").add_child(place)
 
 
-@pytest.fixture
-def backend_b():
-    """Provide an instance of BackendB subclass of DiffSync."""
+@pytest.fixture(scope="session")
+def _backend_b_template():
+    """Provide a loaded BackendB, shared by all tests; use the `backend_b` fixture for a copy that can be modified."""
     diffsync = BackendB(name="backend-b")
     diffsync.load()
     return diffsync
 
 
+@pytest.fixture
+def backend_b(_backend_b_template):
+    """Provide an instance of BackendB subclass of DiffSync."""
+    return clone_backend(_backend_b_template)
+
+
+@pytest.fixture(scope="session")
+def backend_b_ro(_backend_b_template):
+    """Provide a loaded BackendB shared between tests, which therefore must not modify it."""
+    return _backend_b_template
+
+
 class TrackedDiff(Diff):
     """Subclass of Diff that knows when it's completed."""
 
-    is_complete: bool = False
+    __slots__ = ("is_complete",)
+
+    def __init__(self):
+        """Initialize a new, not yet completed, Diff."""
+        super().__init__()
+        self.is_complete = False
 
     def complete(self):
         """Function called when the Diff has been fully constructed and populated with data."""
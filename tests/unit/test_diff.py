@@ -30,6 +30,11 @@ def test_diff_empty():
     assert not diff.has_diffs()
     assert list(diff.get_children()) == []
 
+    # Groups are created on first access, as with any defaultdict
+    assert diff.children["device"] == {}
+    assert list(diff.groups()) == ["device"]
+    assert list(diff.get_children()) == []
+
 
 def test_diff_summary_with_no_diffs():
     diff = Diff()
@@ -55,6 +60,29 @@ def test_diff_len_with_no_diffs():
     assert len(diff) == 0
 
 
+def test_diff_has_diffs_stops_at_first_diff():
+    """Test that has_diffs() doesn't check any further child elements once it has found one with diffs."""
+    checked = []
+
+    class TrackedDiffElement(DiffElement):
+        """DiffElement that records each call to its has_diffs() method."""
+
+        __slots__ = ()
+
+        def has_diffs(self, include_children: bool = True) -> bool:
+            """Record this call before checking for diffs as usual."""
+            checked.append(self.name)
+            return super().has_diffs(include_children=include_children)
+
+    diff = Diff()
+    for name in ("eth0", "eth1", "eth2"):
+        diff.add(TrackedDiffElement("interface", name, {"name": name}))
+    diff.children["interface"]["eth1"].add_attrs(source={"description": "my interface"})
+
+    assert diff.has_diffs()
+    assert checked == ["eth0", "eth1"]
+
+
 def test_diff_children():
     """Test the basic functionality of the Diff class when adding child elements."""
     diff = Diff()
@@ -128,7 +156,7 @@ def test_diff_len_with_diffs(diff_with_children):
     assert len(diff_with_children) == sum(count for count in diff_with_children.summary().values())
 
 
-def test_order_children_default(backend_a, backend_b):
+def test_order_children_default(backend_a_ro, backend_b_ro):
     """Test that order_children_default is properly called when calling get_children."""
 
     class MyDiff(Diff):
@@ -142,13 +170,13 @@ def test_order_children_default(backend_a, backend_b):
                 yield children[key]
 
     # Validating default order method
-    diff_a_b = backend_a.diff_from(backend_b, diff_class=MyDiff)
+    diff_a_b = backend_a_ro.diff_from(backend_b_ro, diff_class=MyDiff)
     children = diff_a_b.get_children()
     children_names = [child.name for child in children]
     assert children_names == ["atl", "nyc", "rdu", "sfo"]
 
 
-def test_order_children_custom(backend_a, backend_b):
+def test_order_children_custom(backend_a_ro, backend_b_ro):
     """Test that a custom order_children method is properly called when calling get_children."""
 
     class MyDiff(Diff):
@@ -161,7 +189,66 @@ def test_order_children_custom(backend_a, backend_b):
             for key in keys:
                 yield children[key]
 
-    diff_a_b = backend_a.diff_from(backend_b, diff_class=MyDiff)
+    diff_a_b = backend_a_ro.diff_from(backend_b_ro, diff_class=MyDiff)
     children = diff_a_b.get_children()
     children_names = [child.name for child in children]
     assert children_names == ["sfo", "rdu", "nyc", "atl"]
+
+
+def test_order_children_instance_method():
+    """Test that an order method defined as an instance method is called on the right Diff instance."""
+
+    class MyDiff(Diff):
+        """custom diff class whose order_children_interface depends on the instance."""
+
+        __slots__ = ("reverse",)
+
+        def __init__(self, reverse=False):
+            super().__init__()
+            self.reverse = reverse
+
+        def order_children_interface(self, children):
+            """Return the interface children ordered according to this instance's `reverse` setting."""
+            for key in sorted(children.keys(), reverse=self.reverse):
+                yield children[key]
+
+    forward_diff = MyDiff()
+    reverse_diff = MyDiff(reverse=True)
+    for diff in (forward_diff, reverse_diff):
+        for name in ("eth1", "eth0", "eth2"):
+            diff.add(DiffElement("interface", name, {"name": name}))
+
+    assert [child.name for child in forward_diff.get_children()] == ["eth0", "eth1", "eth2"]
+    assert [child.name for child in reverse_diff.get_children()] == ["eth2", "eth1", "eth0"]
+    assert not hasattr(forward_diff, "__dict__")
+
+
+def test_diff_str_with_custom_diff_element_str():
+    """Test that a DiffElement subclass overriding str() controls its own part of its parent's str() output."""
+
+    class TerseDiffElement(DiffElement):
+        """DiffElement subclass with a one-line string representation."""
+
+        __slots__ = ()
+
+        def str(self, indent: int = 0):
+            """Summarize this element in a single line."""
+            return f"{' ' * indent}{self.type} {self.name}: {self.action}"
+
+    device = DiffElement("device", "device1", {"name": "device1"})
+    interface = TerseDiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
+    interface.add_attrs(source={"description": "my interface"})
+    device.add_child(interface)
+    diff = Diff()
+    diff.add(device)
+
+    assert (
+        diff.str()
+        == """\
+device
+  device: device1
+    interface
+      interface eth0: create\
+"""
+    )
+    assert interface.str(indent=2) == "  interface eth0: create"
@@ -23,6 +23,7 @@ def test_diff_element_empty():
     element = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
 
     assert element.type == "interface"
+    assert DiffElement("".join(["inter", "face"]), "eth0", {}).type is element.type
     assert element.name == "eth0"
     assert element.keys == {"device_name": "device1", "name": "eth0"}
     assert element.source_name == "source"
@@ -34,6 +35,8 @@ def test_diff_element_empty():
     assert not element.has_diffs(include_children=True)
     assert not element.has_diffs(include_children=False)
     assert element.get_attrs_keys() == []
+    assert not hasattr(element, "__dict__")
+    assert not hasattr(element.child_diff, "__dict__")
 
     element2 = DiffElement(
         "interface", "eth0", {"device_name": "device1", "name": "eth0"}, source_name="S1", dest_name="D1"
@@ -42,6 +45,25 @@ def test_diff_element_empty():
     assert element2.dest_name == "D1"
 
 
+def test_diff_element_ordering_and_equality():
+    eth0 = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
+    eth1 = DiffElement("interface", "eth1", {"device_name": "device1", "name": "eth1"})
+    device = DiffElement("device", "device1", {"name": "device1"})
+
+    assert sorted([eth1, eth0, device]) == [device, eth0, eth1]
+    assert eth0 < eth1 and not eth1 < eth0 and not eth0 < eth0  # pylint: disable=comparison-with-itself
+    assert device < eth1 and eth1 > device
+
+    assert eth0 == eth0  # pylint: disable=comparison-with-itself
+    assert eth0 == DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
+    assert eth0 != eth1
+    assert eth0 != "eth0"
+
+    eth0_copy = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
+    assert hash(eth0) == hash(eth0_copy)
+    assert len({eth0, eth1, device, eth0_copy}) == 3
+
+
 def test_diff_element_summary_with_no_diffs():
     element = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
     assert element.summary() == {"create": 0, "update": 0, "delete": 0, "no-change": 1}
@@ -86,6 +108,28 @@ def test_diff_element_attrs():
     assert element.get_attrs_keys() == ["description"]  # intersection of source_attrs.keys() and dest_attrs.keys()
 
 
+def test_diff_element_attrs_diffs_reflect_changed_attrs():
+    """Check that get_attrs_diffs() and action are recalculated whenever source_attrs or dest_attrs are replaced."""
+    element = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
+    assert element.get_attrs_diffs() == {}
+
+    element.add_attrs(source={"interface_type": "ethernet", "description": "my interface"})
+    diffs = element.get_attrs_diffs()
+    assert diffs == {"+": {"interface_type": "ethernet", "description": "my interface"}}
+    assert element.get_attrs_diffs() is diffs
+
+    assert element.action == "create"
+    element.add_attrs(dest={"description": "your interface"})
+    assert element.get_attrs_diffs() == {"-": {"description": "your interface"}, "+": {"description": "my interface"}}
+    assert element.action == "update"
+    assert element.has_diffs(include_children=False)
+
+    element.dest_attrs = {"description": "my interface"}
+    assert element.get_attrs_diffs() == {"-": {}, "+": {}}
+    assert element.action is None
+    assert not element.has_diffs(include_children=False)
+
+
 def test_diff_element_summary_with_diffs():
     element = DiffElement("interface", "eth0", {"device_name": "device1", "name": "eth0"})
     element.add_attrs(source={"interface_type": "ethernet", "description": "my interface"})
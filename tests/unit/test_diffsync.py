@@ -15,19 +15,26 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import sys
+import time
+from typing import List
 from unittest import mock
+import weakref
 
 import pytest
 
 from diffsync import DiffSync, DiffSyncModel, DiffSyncFlags, DiffSyncModelFlags
 from diffsync.exceptions import DiffClassMismatch, ObjectAlreadyExists, ObjectNotFound, ObjectCrudException
+from diffsync.helpers import DiffSyncDiffer, DiffSyncSyncer
 
 from .conftest import Site, Device, Interface, TrackedDiff, BackendA, PersonA
 
 
-def test_diffsync_default_name_type(generic_diffsync):
-    assert generic_diffsync.type == "DiffSync"
-    assert generic_diffsync.name == "DiffSync"
+def test_diffsync_default_name_type(generic_diffsync_ro):
+    assert generic_diffsync_ro.type == "DiffSync"
+    assert generic_diffsync_ro.name == "DiffSync"
 
 
 def test_diffsync_generic_load_is_noop(generic_diffsync):
@@ -35,21 +42,21 @@ def test_diffsync_generic_load_is_noop(generic_diffsync):
     assert len(generic_diffsync._data) == 0  # pylint: disable=protected-access
 
 
-def test_diffsync_dict_with_no_data(generic_diffsync):
-    assert generic_diffsync.dict() == {}
+def test_diffsync_dict_with_no_data(generic_diffsync_ro):
+    assert generic_diffsync_ro.dict() == {}
 
 
-def test_diffsync_str_with_no_data(generic_diffsync):
-    assert generic_diffsync.str() == ""
+def test_diffsync_str_with_no_data(generic_diffsync_ro):
+    assert generic_diffsync_ro.str() == ""
 
 
-def test_diffsync_len_with_no_data(generic_diffsync):
-    assert len(generic_diffsync) == 0
+def test_diffsync_len_with_no_data(generic_diffsync_ro):
+    assert len(generic_diffsync_ro) == 0
 
 
-def test_diffsync_diff_self_with_no_data_has_no_diffs(generic_diffsync):
-    assert generic_diffsync.diff_from(generic_diffsync).has_diffs() is False
-    assert generic_diffsync.diff_to(generic_diffsync).has_diffs() is False
+def test_diffsync_diff_self_with_no_data_has_no_diffs(generic_diffsync_ro):
+    assert generic_diffsync_ro.diff_from(generic_diffsync_ro).has_diffs() is False
+    assert generic_diffsync_ro.diff_to(generic_diffsync_ro).has_diffs() is False
 
 
 def test_diffsync_sync_self_with_no_data_is_noop(generic_diffsync):
@@ -60,25 +67,42 @@ def test_diffsync_sync_self_with_no_data_is_noop(generic_diffsync):
     assert not generic_diffsync.sync_complete.called
 
 
-def test_diffsync_get_with_no_data_fails(generic_diffsync):
+def test_diffsync_get_with_no_data_fails(generic_diffsync_ro):
     with pytest.raises(ObjectNotFound):
-        generic_diffsync.get("anything", "myname")
+        generic_diffsync_ro.get("anything", "myname")
     with pytest.raises(ObjectNotFound):
-        generic_diffsync.get(DiffSyncModel, "")
+        generic_diffsync_ro.get(DiffSyncModel, "")
+    # Failed lookups shouldn't leave empty per-model entries behind in the store
+    assert generic_diffsync_ro.dict() == {}
 
 
-def test_diffsync_get_all_with_no_data_is_empty_list(generic_diffsync):
-    assert list(generic_diffsync.get_all("anything")) == []
-    assert list(generic_diffsync.get_all(DiffSyncModel)) == []
+def test_diffsync_get_all_with_no_data_is_empty_list(generic_diffsync_ro):
+    assert list(generic_diffsync_ro.get_all("anything")) == []
+    assert list(generic_diffsync_ro.get_all(DiffSyncModel)) == []
+    assert generic_diffsync_ro.dict() == {}
 
 
-def test_diffsync_get_by_uids_with_no_data(generic_diffsync):
-    assert generic_diffsync.get_by_uids([], "anything") == []
-    assert generic_diffsync.get_by_uids([], DiffSyncModel) == []
+def test_diffsync_get_by_uids_with_no_data(generic_diffsync_ro):
+    assert generic_diffsync_ro.get_by_uids([], "anything") == []
+    assert generic_diffsync_ro.get_by_uids([], DiffSyncModel) == []
     with pytest.raises(ObjectNotFound):
-        generic_diffsync.get_by_uids(["any", "another"], "anything")
+        generic_diffsync_ro.get_by_uids(["any", "another"], "anything")
     with pytest.raises(ObjectNotFound):
-        generic_diffsync.get_by_uids(["any", "another"], DiffSyncModel)
+        generic_diffsync_ro.get_by_uids(["any", "another"], DiffSyncModel)
+
+
+def test_diffsync_add_constructed_model(generic_diffsync, make_device):
+    """Check that models created via construct() (without validation) behave the same as validated ones."""
+    device = Device.construct(name="device1", site_name="site1", role="default")
+    generic_diffsync.add(device)
+    assert generic_diffsync.get(Device, "device1") is device
+    assert device.diffsync is generic_diffsync
+    assert device.dict() == make_device().dict()
+    assert device.get_attrs() == {"role": "default"}
+    device.add_child(Interface(device_name="device1", name="eth0"))
+    assert device.interfaces == ["device1__eth0"]
+    # Mutable defaults are not shared between instances
+    assert Device.construct(name="device2").interfaces == []
 
 
 def test_diffsync_add_no_raises_existing_same_object(generic_diffsync):
@@ -202,6 +226,51 @@ def test_diffsync_update_or_instantiate_create_object_w_attrs(generic_diffsync):
     assert obj.description == "Testing"
 
 
+def test_diffsync_lookups_honor_overridden_get(backend_a, backend_b):
+    class TrackedBackendA(BackendA):
+        """BackendA that records every lookup made through get() and get_by_uids()."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.lookups = []
+
+        def get(self, obj, identifier):
+            self.lookups.append(("get", obj, identifier))
+            return super().get(obj, identifier)
+
+        def get_by_uids(self, uids, obj):
+            self.lookups.append(("get_by_uids", obj, list(uids)))
+            return super().get_by_uids(uids, obj)
+
+    tracked = TrackedBackendA(name=backend_a.name)
+    for store in backend_a._data.values():  # pylint: disable=protected-access
+        for model in list(store.values()):
+            backend_a.remove(model)
+            tracked.add(model)
+
+    obj, created = tracked.get_or_instantiate(Site, {"name": "nyc"})
+    assert not created
+    assert obj is tracked.get(Site, "nyc")
+    assert tracked.lookups[0] == ("get", "site", "nyc")
+
+    tracked.lookups.clear()
+    _, created = tracked.update_or_instantiate(Site, {"name": "nyc"}, {})
+    assert not created
+    assert tracked.lookups == [("get", "site", "nyc")]
+
+    tracked.lookups.clear()
+    tracked.diff_from(backend_b)
+    assert any(lookup[0] == "get_by_uids" for lookup in tracked.lookups)
+
+    tracked.lookups.clear()
+    tracked.sync_from(backend_b)
+    assert any(lookup[0] == "get" for lookup in tracked.lookups)
+
+    tracked.lookups.clear()
+    tracked.get(Site, "nyc").str()
+    assert any(lookup[0] == "get" and lookup[1] == "device" for lookup in tracked.lookups)
+
+
 def test_diffsync_get_with_generic_model(generic_diffsync, generic_diffsync_model):
     generic_diffsync.add(generic_diffsync_model)
     # The generic_diffsync_model has an empty identifier/unique-id
@@ -236,6 +305,10 @@ def test_diffsync_get_by_uids_with_generic_model(generic_diffsync, generic_diffs
     # Valid unique-id mixed in with unknown ones
     with pytest.raises(ObjectNotFound):
         generic_diffsync.get_by_uids(["aname", "", "anothername"], DiffSyncModel)
+    # pylint: disable=protected-access
+    assert generic_diffsync._get_by_uids_fast([""], DiffSyncModel.get_type()) == {"": generic_diffsync_model}
+    with pytest.raises(ObjectNotFound):
+        generic_diffsync._get_by_uids_fast(["aname", ""], DiffSyncModel.get_type())
 
 
 def test_diffsync_remove_with_generic_model(generic_diffsync, generic_diffsync_model):
@@ -294,8 +367,8 @@ def test_diffsync_subclass_validation_top_level_not_diffsyncmodel():
     assert "is not a DiffSyncModel" in str(excinfo.value)
 
 
-def test_diffsync_dict_with_data(backend_a):
-    assert backend_a.dict() == {
+def test_diffsync_dict_with_data(backend_a_ro):
+    assert backend_a_ro.dict() == {
         "device": {
             "nyc-spine1": {
                 "interfaces": ["nyc-spine1__eth0", "nyc-spine1__eth1"],
@@ -358,9 +431,9 @@ def test_diffsync_dict_with_data(backend_a):
     }
 
 
-def test_diffsync_str_with_data(backend_a):
+def test_diffsync_str_with_data(backend_a_ro):
     assert (
-        backend_a.str()
+        backend_a_ro.str()
         == """\
 site
   site: nyc: {}
@@ -403,32 +476,33 @@ unused: []\
     )
 
 
-def test_diffsync_len_with_data(backend_a):
-    assert len(backend_a) == 23
+def test_diffsync_len_with_data(backend_a_ro):
+    assert len(backend_a_ro) == 23
 
 
-def test_diffsync_diff_self_with_data_has_no_diffs(backend_a):
+def test_diffsync_diff_self_with_data_has_no_diffs(backend_a_ro):
     # Self diff should always show no diffs!
-    assert backend_a.diff_from(backend_a).has_diffs() is False
-    assert backend_a.diff_to(backend_a).has_diffs() is False
+    assert backend_a_ro.diff_from(backend_a_ro).has_diffs() is False
+    assert backend_a_ro.diff_to(backend_a_ro).has_diffs() is False
 
 
-def test_diffsync_diff_other_with_data_has_diffs(backend_a, backend_b):
-    assert backend_a.diff_to(backend_b).has_diffs() is True
-    assert backend_a.diff_from(backend_b).has_diffs() is True
+def test_diffsync_diff_other_with_data_has_diffs(backend_a_ro, backend_b_ro):
+    assert backend_a_ro.diff_to(backend_b_ro).has_diffs() is True
+    assert backend_a_ro.diff_from(backend_b_ro).has_diffs() is True
 
 
-def test_diffsync_diff_to_and_diff_from_are_symmetric(backend_a, backend_b):
-    diff_ab = backend_a.diff_from(backend_b)
-    diff_ba = backend_a.diff_to(backend_b)
+def test_diffsync_diff_to_and_diff_from_are_symmetric(backend_a_ro, backend_b_ro):
+    diff_ab = backend_a_ro.diff_from(backend_b_ro)
+    diff_ba = backend_a_ro.diff_to(backend_b_ro)
 
     def check_diff_symmetry(diff1, diff2):
         """Recursively compare two Diffs to make sure they are equal and opposite to one another."""
-        assert len(list(diff1.get_children())) == len(list(diff2.get_children()))
-        for elem1, elem2 in zip(sorted(diff1.get_children()), sorted(diff2.get_children())):
+        elems2 = {(elem.type, elem.name): elem for elem in diff2.get_children()}
+        elems1 = list(diff1.get_children())
+        assert len(elems1) == len(elems2)
+        for elem1 in elems1:
+            elem2 = elems2[(elem1.type, elem1.name)]
             # Same basic properties
-            assert elem1.type == elem2.type
-            assert elem1.name == elem2.name
             assert elem1.keys == elem2.keys
             assert elem1.has_diffs() == elem2.has_diffs()
             # Opposite diffs, if any
@@ -439,8 +513,34 @@ def test_diffsync_diff_to_and_diff_from_are_symmetric(backend_a, backend_b):
     check_diff_symmetry(diff_ab, diff_ba)
 
 
-def test_diffsync_diff_from_with_custom_diff_class(backend_a, backend_b):
-    diff_ba = backend_a.diff_from(backend_b, diff_class=TrackedDiff)
+def test_diffsync_diff_from_shortname_mismatch_raises():
+    class SiteWithCode(DiffSyncModel):
+        _modelname = "site"
+        _identifiers = ("name",)
+        _shortname = ("code",)
+
+        name: str
+        code: str
+
+    class SitesWithCodes(DiffSync):
+        site = SiteWithCode
+        top_level = ["site"]
+
+    class SitesWithNames(DiffSync):
+        site = Site
+        top_level = ["site"]
+
+    with_codes = SitesWithCodes()
+    with_codes.add(SiteWithCode(name="nyc", code="NYC01"))
+    with_names = SitesWithNames()
+    with_names.add(Site(name="nyc"))
+
+    with pytest.raises(ValueError, match="Shortname mismatch"):
+        with_names.diff_from(with_codes)
+
+
+def test_diffsync_diff_from_with_custom_diff_class(backend_a_ro, backend_b_ro):
+    diff_ba = backend_a_ro.diff_from(backend_b_ro, diff_class=TrackedDiff)
     diff_children = diff_ba.get_children()
 
     assert isinstance(diff_ba, TrackedDiff)
@@ -448,6 +548,50 @@ def test_diffsync_diff_from_with_custom_diff_class(backend_a, backend_b):
         if child.child_diff:
             assert isinstance(child.child_diff, TrackedDiff)
     assert diff_ba.is_complete is True
+    assert not hasattr(diff_ba, "__dict__")
+
+
+def test_diffsync_diff_from_use_cache(backend_a, backend_b):
+    diff = backend_a.diff_from(backend_b, use_cache=True)
+    assert backend_a.diff_from(backend_b, use_cache=True) is diff
+    assert backend_b.diff_to(backend_a, use_cache=True) is diff
+    # Without use_cache, or with different inputs, the diff is recalculated
+    assert backend_a.diff_from(backend_b) is not diff
+    assert backend_a.diff_from(backend_b, flags=DiffSyncFlags.SKIP_UNMATCHED_DST, use_cache=True) is not diff
+    diff = backend_a.diff_from(backend_b, use_cache=True)
+
+    # Any change to either side's data invalidates the cached diff
+    _, created = backend_b.update_or_instantiate(Device, {"name": "nyc-spine1"}, {"role": "leaf"})
+    assert not created
+    new_diff = backend_a.diff_from(backend_b, use_cache=True)
+    assert new_diff is not diff
+    assert backend_a.diff_from(backend_b, use_cache=True) is new_diff
+
+    site_lax = Site(name="lax")
+    backend_a.add(site_lax)
+    diff = backend_a.diff_from(backend_b, use_cache=True)
+    assert diff is not new_diff
+
+    backend_a.remove(site_lax)
+    new_diff = backend_a.diff_from(backend_b, use_cache=True)
+    assert new_diff is not diff
+
+    backend_a.sync_from(backend_b, diff=new_diff)
+    diff = backend_a.diff_from(backend_b, use_cache=True)
+    assert diff is not new_diff
+    assert not diff.has_diffs()
+
+    # Changes made directly to a stored model's fields are not detected
+    backend_a.get(Device, "nyc-spine1").role = "spine"
+    assert backend_a.diff_from(backend_b, use_cache=True) is diff
+
+    # The cache doesn't keep the source alive
+    source = BackendA()
+    backend_a.diff_from(source, use_cache=True)
+    source_ref = weakref.ref(source)
+    del source
+    gc.collect()
+    assert source_ref() is None
 
 
 def test_diffsync_diff_with_callback(backend_a, backend_b):
@@ -468,6 +612,39 @@ def test_diffsync_diff_with_callback(backend_a, backend_b):
     assert last_value == {"current": expected, "total": expected}
 
 
+def test_diffsync_sync_handlers_modifying_attrs_dont_affect_diff(backend_b_ro):
+    class RemoteIdInterface(Interface):
+        """Interface whose create() and update() add a key of their own to the given attrs, as in example 03."""
+
+        @classmethod
+        def create(cls, diffsync, ids, attrs):
+            attrs["remote_id"] = 1
+            return super().create(diffsync, ids, {key: attrs[key] for key in cls._attributes if key in attrs})
+
+        def update(self, attrs):
+            attrs["remote_id"] = 1
+            return super().update({key: attrs[key] for key in self._attributes if key in attrs})
+
+    class RemoteIdBackend(BackendA):
+        """BackendA, but using RemoteIdInterface."""
+
+        interface = RemoteIdInterface
+
+    backend = RemoteIdBackend()
+    backend.load()
+    diff = backend.diff_from(backend_b_ro)
+    diff_dict, diff_str = diff.dict(), diff.str()
+    summary = diff.summary()
+    assert summary["create"] and summary["update"]
+
+    backend.sync_from(backend_b_ro, diff=diff)
+    assert not backend.diff_from(backend_b_ro).has_diffs()
+    # The diff that was synced should be unaffected by the handlers' changes to attrs
+    assert diff.dict() == diff_dict
+    assert diff.str() == diff_str
+    assert diff.summary() == summary
+
+
 def test_diffsync_sync_to_w_different_diff_class_raises(backend_a, backend_b):
     diff = backend_b.diff_to(backend_a)
     with pytest.raises(DiffClassMismatch) as failure:
@@ -519,6 +696,18 @@ def test_diffsync_sync_from_w_diff(backend_a, backend_b):
     assert not backend_b.diff_to.called
 
 
+def test_diffsync_syncer_sync_diff_element_syncs_subtree(backend_a, backend_b):
+    diff = backend_a.diff_from(backend_b)
+    syncer = DiffSyncSyncer(diff=diff, src_diffsync=backend_b, dst_diffsync=backend_a, flags=DiffSyncFlags.NONE)
+    site_sfo = diff.children["site"]["sfo"]
+
+    assert syncer.sync_diff_element(site_sfo) is True
+    # The element's descendants were synchronized as well
+    assert backend_a.get(Device, "sfo-spine1").role == "leaf"  # was initially "spine"
+    # ...but nothing outside of the given element was touched
+    assert backend_a.get(Site, "rdu")
+
+
 def test_diffsync_sync_from(backend_a, backend_b):
     backend_a.sync_complete = mock.Mock()
     backend_b.sync_complete = mock.Mock()
@@ -573,6 +762,111 @@ def test_diffsync_sync_with_callback(backend_a, backend_b):
     assert last_value == {"current": expected, "total": expected}
 
 
+def test_diffsync_diff_from_parallel_toplevel(backend_a, backend_b):
+    models_processed = []
+
+    def callback(stage, current, total):  # pylint: disable=unused-argument
+        models_processed.append(current)
+
+    diff = backend_a.diff_from(backend_b)
+    parallel_diff = backend_a.diff_from(backend_b, flags=DiffSyncFlags.PARALLEL_TOPLEVEL, callback=callback)
+    assert parallel_diff.dict() == diff.dict()
+    assert parallel_diff.str() == diff.str()
+    assert max(models_processed) == len(backend_a) + len(backend_b)
+
+
+@pytest.mark.parametrize("cpu_count, expected_workers", [(None, None), (1, None), (8, 2)])
+def test_diffsync_diff_from_parallel_toplevel_workers(backend_a, backend_b, cpu_count, expected_workers):
+    diff = backend_a.diff_from(backend_b)
+    with mock.patch("diffsync.helpers.os.cpu_count", return_value=cpu_count), mock.patch(
+        "diffsync.helpers.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+    ) as executor:
+        parallel_diff = backend_a.diff_from(backend_b, flags=DiffSyncFlags.PARALLEL_TOPLEVEL)
+    assert parallel_diff.dict() == diff.dict()
+    # No more threads than there are CPUs or top-level types (of which there are two), and none at all if only one
+    if expected_workers is None:
+        assert not executor.called
+    else:
+        executor.assert_called_once_with(max_workers=expected_workers)
+
+
+def test_diffsync_sync_from_parallel(backend_a, backend_b):
+    expected = len(backend_a.diff_from(backend_b))
+    last_value = {"current": 0, "total": 0}
+
+    def callback(stage, current, total):
+        if stage == "sync":
+            last_value["current"] = max(last_value["current"], current)
+            last_value["total"] = total
+
+    backend_a.sync_complete = mock.Mock()
+    backend_a.sync_from(backend_b, callback=callback, parallel=4)
+
+    assert backend_a.sync_complete.called
+    assert last_value == {"current": expected, "total": expected}
+    assert backend_a.diff_from(backend_b).has_diffs() is False
+
+    # The end result should be the same as for a sequential sync
+    backend_a_sequential = BackendA()
+    backend_a_sequential.load()
+    backend_a_sequential.sync_from(backend_b)
+    assert backend_a.dict() == backend_a_sequential.dict()
+
+
+def test_diffsync_syncer_lock_only_for_parallel_sync(backend_a, backend_b):
+    diff = backend_a.diff_from(backend_b)
+    kwargs = {"diff": diff, "src_diffsync": backend_b, "dst_diffsync": backend_a, "flags": DiffSyncFlags.NONE}
+    assert DiffSyncSyncer(**kwargs).lock is None
+    assert DiffSyncSyncer(**kwargs, parallel=4).lock is not None
+
+
+def test_diffsync_sync_from_parallel_preserves_top_level_order():
+    class Region(DiffSyncModel):
+        """Model that is slow to create."""
+
+        _modelname = "region"
+        _identifiers = ("name",)
+
+        name: str
+
+        @classmethod
+        def create(cls, diffsync, ids, attrs):
+            time.sleep(0.01)
+            return super().create(diffsync, ids, attrs)
+
+    class Country(DiffSyncModel):
+        """Model whose creation requires its Region to have already been created."""
+
+        _modelname = "country"
+        _identifiers = ("name",)
+        _attributes = ("region",)
+
+        name: str
+        region: str
+
+        @classmethod
+        def create(cls, diffsync, ids, attrs):
+            diffsync.get(Region, attrs["region"])
+            return super().create(diffsync, ids, attrs)
+
+    class Geography(DiffSync):
+        """DiffSync in which Countries must be synced after Regions."""
+
+        region = Region
+        country = Country
+        top_level = ["region", "country"]
+
+    source = Geography()
+    for region_name in ("africa", "europe"):
+        source.add(Region(name=region_name))
+    for country_name, region_name in (("kenya", "africa"), ("france", "europe"), ("spain", "europe")):
+        source.add(Country(name=country_name, region=region_name))
+
+    target = Geography()
+    target.sync_from(source, parallel=4)
+    assert not target.diff_from(source).has_diffs()
+
+
 def check_successful_sync_log_sanity(log, src, dst, flags):
     """Given a successful sync, make sure the captured structlogs are correct at a high level."""
     # All logs generated during the sync should include the src, dst, and flags data
@@ -698,14 +992,14 @@ def test_diffsync_sync_from_successful_logging(log, backend_a, backend_b):
     check_sync_logs_against_diff(backend_a, diff, log)
 
 
-def test_diffsync_subclass_default_name_type(backend_a):
-    assert backend_a.name == "BackendA"
-    assert backend_a.type == "BackendA"
+def test_diffsync_subclass_default_name_type(backend_a_ro):
+    assert backend_a_ro.name == "BackendA"
+    assert backend_a_ro.type == "BackendA"
 
 
-def test_diffsync_subclass_custom_name_type(backend_b):
-    assert backend_b.name == "backend-b"
-    assert backend_b.type == "Backend_B"
+def test_diffsync_subclass_custom_name_type(backend_b_ro):
+    assert backend_b_ro.name == "backend-b"
+    assert backend_b_ro.type == "Backend_B"
 
 
 def test_diffsync_add_get_remove_with_subclass_and_data(backend_a):
@@ -755,7 +1049,6 @@ def test_diffsync_sync_from_with_continue_on_failure_flag(log, error_prone_backe
     )
     # Not all sync operations succeeded on the first try
     remaining_diffs = error_prone_backend_a.diff_from(backend_b)
-    print(remaining_diffs.str())  # for debugging of any failure
     assert remaining_diffs.has_diffs()
 
     # At least some operations of each type should have succeeded
@@ -763,63 +1056,93 @@ def test_diffsync_sync_from_with_continue_on_failure_flag(log, error_prone_backe
     assert log.has("Updated successfully", status="success")
     assert log.has("Deleted successfully", status="success")
     # Some ERROR messages should have been logged
-    assert [event for event in log.events if event["level"] == "error"] != []
+    assert any(event["level"] == "error" for event in log.events)
     # Some messages with status="error" should have been logged - these may be the same as the above
-    assert [event for event in log.events if event.get("status") == "error"] != []
+    assert any(event.get("status") == "error" for event in log.events)
 
     check_sync_logs_against_diff(error_prone_backend_a, base_diffs, log, errors_permitted=True)
 
     log.events = []
 
     # Retry up to 10 times, we should sync successfully eventually
-    for i in range(10):
-        print(f"Sync retry #{i}")
+    for _ in range(10):
         error_prone_backend_a.sync_from(backend_b, flags=DiffSyncFlags.CONTINUE_ON_FAILURE)
         remaining_diffs = error_prone_backend_a.diff_from(backend_b)
-        print(remaining_diffs.str())  # for debugging of any failure
         if remaining_diffs.has_diffs():
-            # If we still have diffs, some ERROR messages should have been logged
-            assert [event for event in log.events if event["level"] == "error"] != []
-            # Some messages with status="errored" should have been logged - these may be the same as the above
-            assert [event for event in log.events if event.get("status") == "error"] != []
+            # If we still have diffs, some ERROR messages (or, for non-fatal failures, WARNING messages) should have
+            # been logged, with a corresponding status="error" or status="failure"
+            assert any(event["level"] in ("error", "warning") for event in log.events)
+            assert any(event.get("status") in ("error", "failure") for event in log.events)
             log.events = []
         else:
             # No error messages should have been logged on the last, fully successful attempt
-            assert [event for event in log.events if event["level"] == "error"] == []
+            assert not any(event["level"] == "error" for event in log.events)
             # Something must have succeeded for us to be done
-            assert [event for event in log.events if event.get("status") == "success"] != []
+            assert any(event.get("status") == "success" for event in log.events)
             break
     else:
-        pytest.fail("Sync was still incomplete after 10 retries")
+        pytest.fail(f"Sync was still incomplete after 10 retries:\n{remaining_diffs.str()}")
 
 
 def test_diffsync_diff_with_skip_unmatched_src_flag(
-    backend_a, backend_a_with_extra_models, backend_a_minus_some_models
+    backend_a_ro, backend_a_with_extra_models, backend_a_minus_some_models
 ):
-    assert backend_a.diff_from(backend_a_with_extra_models).has_diffs()
+    assert backend_a_ro.diff_from(backend_a_with_extra_models).has_diffs()
     # SKIP_UNMATCHED_SRC should mean that extra models in the src are not flagged for creation in the dest
-    assert not backend_a.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC).has_diffs()
+    assert not backend_a_ro.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC).has_diffs()
     # SKIP_UNMATCHED_SRC should NOT mean that extra models in the dst are not flagged for deletion in the src
-    assert backend_a.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC).has_diffs()
+    assert backend_a_ro.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC).has_diffs()
 
 
 def test_diffsync_diff_with_skip_unmatched_dst_flag(
-    backend_a, backend_a_with_extra_models, backend_a_minus_some_models
+    backend_a_ro, backend_a_with_extra_models, backend_a_minus_some_models
 ):
-    assert backend_a.diff_from(backend_a_minus_some_models).has_diffs()
+    assert backend_a_ro.diff_from(backend_a_minus_some_models).has_diffs()
     # SKIP_UNMATCHED_DST should mean that missing models in the src are not flagged for deletion from the dest
-    assert not backend_a.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST).has_diffs()
+    assert not backend_a_ro.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST).has_diffs()
     # SKIP_UNMATCHED_DST should NOT mean that extra models in the src are not flagged for creation in the dest
-    assert backend_a.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST).has_diffs()
+    assert backend_a_ro.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST).has_diffs()
 
 
 def test_diffsync_diff_with_skip_unmatched_both_flag(
-    backend_a, backend_a_with_extra_models, backend_a_minus_some_models
+    backend_a_ro, backend_a_with_extra_models, backend_a_minus_some_models
 ):
     # SKIP_UNMATCHED_BOTH should mean that extra models in the src are not flagged for creation in the dest
-    assert not backend_a.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_BOTH).has_diffs()
+    assert not backend_a_ro.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_BOTH).has_diffs()
     # SKIP_UNMATCHED_BOTH should mean that missing models in the src are not flagged for deletion from the dest
-    assert not backend_a.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_BOTH).has_diffs()
+    assert not backend_a_ro.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_BOTH).has_diffs()
+
+
+def test_diffsync_diff_with_skip_unmatched_flags_prunes_unmatched_objects(
+    monkeypatch, backend_a_ro, backend_a_with_extra_models, backend_a_minus_some_models
+):
+    pairs = []
+    original_diff_object_pair = DiffSyncDiffer.diff_object_pair
+
+    def diff_object_pair(self, src_obj, dst_obj, pending=None):
+        pairs.append((src_obj, dst_obj))
+        return original_diff_object_pair(self, src_obj, dst_obj, pending)
+
+    monkeypatch.setattr(DiffSyncDiffer, "diff_object_pair", diff_object_pair)
+
+    # Unmatched objects (and hence their children) should never even be paired up for comparison
+    backend_a_ro.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC)
+    assert pairs and all(dst_obj is not None for _, dst_obj in pairs)
+    pairs.clear()
+    backend_a_ro.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST)
+    assert pairs and all(src_obj is not None for src_obj, _ in pairs)
+
+
+def test_diffsync_diff_with_skip_unmatched_flags_logs_pruned_objects(
+    log, backend_a_ro, backend_a_with_extra_models, backend_a_minus_some_models
+):
+    backend_a_ro.diff_from(backend_a_with_extra_models, flags=DiffSyncFlags.SKIP_UNMATCHED_SRC)
+    assert log.has("Skipping unmatched source object", level="debug", model="site", unique_id="lax")
+    assert log.has("Skipping unmatched source object", level="debug", model="device", unique_id="nyc-spine3")
+
+    backend_a_ro.diff_from(backend_a_minus_some_models, flags=DiffSyncFlags.SKIP_UNMATCHED_DST)
+    assert log.has("Skipping unmatched dest object", level="debug", model="site", unique_id="rdu")
+    assert log.has("Skipping unmatched dest object", level="debug", model="device", unique_id="sfo-spine2")
 
 
 def test_diffsync_sync_with_skip_unmatched_src_flag(backend_a, backend_a_with_extra_models):
@@ -847,8 +1170,7 @@ def test_diffsync_diff_with_ignore_flag_on_source_models(backend_a, backend_a_wi
     backend_a_with_extra_models.get(backend_a_with_extra_models.site, "nyc").model_flags |= DiffSyncModelFlags.IGNORE
 
     diff = backend_a.diff_from(backend_a_with_extra_models)
-    print(diff.str())  # for debugging of any failure
-    assert not diff.has_diffs()
+    assert not diff.has_diffs(), diff.str()
 
 
 def test_diffsync_diff_with_ignore_flag_on_target_models(backend_a, backend_a_minus_some_models):
@@ -858,11 +1180,10 @@ def test_diffsync_diff_with_ignore_flag_on_target_models(backend_a, backend_a_mi
     backend_a.get(backend_a.site, "sfo").model_flags |= DiffSyncModelFlags.IGNORE
 
     diff = backend_a.diff_from(backend_a_minus_some_models)
-    print(diff.str())  # for debugging of any failure
-    assert not diff.has_diffs()
+    assert not diff.has_diffs(), diff.str()
 
 
-def test_diffsync_sync_skip_children_on_delete(backend_a):
+def test_diffsync_sync_skip_children_on_delete(backend_a_ro):
     class NoDeleteInterface(Interface):
         """Interface that shouldn't be deleted directly."""
 
@@ -886,11 +1207,81 @@ def test_diffsync_sync_skip_children_on_delete(backend_a):
     assert extra_models.get(extra_models.interface, "nyc-spine3__eth0") is not None
 
     # NoDeleteInterface.delete() should not be called since we're deleting its parent only
-    extra_models.sync_from(backend_a)
+    extra_models.sync_from(backend_a_ro)
     # The extra interface should have been removed from the DiffSync without calling its delete() method
     with pytest.raises(ObjectNotFound):
         extra_models.get(extra_models.interface, extra_interface.get_unique_id())
     # The sync should be complete, regardless
-    diff = extra_models.diff_from(backend_a)
-    print(diff.str())  # for debugging of any failure
-    assert not diff.has_diffs()
+    diff = extra_models.diff_from(backend_a_ro)
+    assert not diff.has_diffs(), diff.str()
+
+
+def test_diffsync_diff_deeply_nested_models():
+    """Check that neither diff calculation, nor using the resulting Diff, recurses once per level of the hierarchy."""
+
+    class Node(DiffSyncModel):
+        """Model whose children are further Nodes."""
+
+        _modelname = "node"
+        _identifiers = ("name",)
+        _attributes = ("value",)
+        _children = {"node": "nodes"}
+
+        name: str
+        value: int = 0
+        nodes: List = []
+
+    class Root(Node):
+        """Top-level Node."""
+
+        _modelname = "root"
+
+    class NodeDiffSync(DiffSync):
+        """DiffSync holding a single, very deep, chain of Nodes."""
+
+        root = Root
+        node = Node
+
+        top_level = ["root"]
+
+        def load(self, depth, value):
+            """Load a chain of the given depth, with the given value on its deepest Node."""
+            parent = self.root(name="root")
+            self.add(parent)
+            for level in range(depth):
+                node = self.node(name=f"node{level}", value=value if level == depth - 1 else 0)
+                self.add(node)
+                parent.add_child(node)
+                parent = node
+
+    depth = sys.getrecursionlimit()
+    src = NodeDiffSync()
+    src.load(depth, value=1)
+    dst = NodeDiffSync()
+    dst.load(depth, value=2)
+
+    diff = dst.diff_from(src)
+    element = next(diff.get_children())
+    for _ in range(depth):
+        assert element.action is None
+        element = next(element.get_children())
+    assert element.name == f"node{depth - 1}"
+    assert element.get_attrs_diffs() == {"-": {"value": 2}, "+": {"value": 1}}
+
+    # The resulting Diff should be just as usable, without recursing either
+    assert diff.has_diffs()
+    assert len(diff) == depth + 1
+    assert diff.summary() == {"create": 0, "update": 1, "delete": 0, "no-change": depth}
+    diff_lines = diff.str().splitlines()
+    assert len(diff_lines) == 2 + 2 * depth + 1  # root group and element, a group and element per Node, the diff
+    assert diff_lines[-2] == f"{' ' * (4 * depth + 2)}node: node{depth - 1}"
+    assert diff_lines[-1] == f"{' ' * (4 * depth + 4)}value    NodeDiffSync(1)    NodeDiffSync(2)"
+    diff_dict = diff.dict()
+    for level in range(depth):
+        diff_dict = diff_dict["node"] if level else diff_dict["root"]["root"]["node"]
+        diff_dict = diff_dict[f"node{level}"]
+    assert diff_dict == {"-": {"value": 2}, "+": {"value": 1}}
+
+    dst.sync_from(src, diff=diff)
+    assert dst.get(Node, f"node{depth - 1}").value == 1
+    assert not dst.diff_from(src).has_diffs()
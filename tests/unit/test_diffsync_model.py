@@ -15,7 +15,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from typing import List
+from typing import Dict, List, Set
 
 import pytest
 
@@ -25,31 +25,31 @@ from diffsync.exceptions import ObjectStoreWrongType, ObjectAlreadyExists, Objec
 from .conftest import Device, Interface
 
 
-def test_generic_diffsync_model_methods(generic_diffsync_model, make_site):
+def test_generic_diffsync_model_methods(generic_diffsync_model_ro, make_site):
     """Check the default behavior of various APIs of a DiffSyncModel."""
-    assert str(generic_diffsync_model) == ""
-    assert repr(generic_diffsync_model) == 'diffsyncmodel ""'
+    assert str(generic_diffsync_model_ro) == ""
+    assert repr(generic_diffsync_model_ro) == 'diffsyncmodel ""'
 
-    assert generic_diffsync_model.get_type() == "diffsyncmodel"
-    assert generic_diffsync_model.get_identifiers() == {}
-    assert generic_diffsync_model.get_attrs() == {}
-    assert generic_diffsync_model.get_unique_id() == ""
-    assert generic_diffsync_model.get_shortname() == ""
+    assert generic_diffsync_model_ro.get_type() == "diffsyncmodel"
+    assert generic_diffsync_model_ro.get_identifiers() == {}
+    assert generic_diffsync_model_ro.get_attrs() == {}
+    assert generic_diffsync_model_ro.get_unique_id() == ""
+    assert generic_diffsync_model_ro.get_shortname() == ""
 
     with pytest.raises(ObjectStoreWrongType):
-        generic_diffsync_model.add_child(make_site())
+        generic_diffsync_model_ro.add_child(make_site())
 
 
-def test_diffsync_model_dict_with_no_data(generic_diffsync_model):
-    assert generic_diffsync_model.dict() == {"model_flags": DiffSyncModelFlags.NONE}
+def test_diffsync_model_dict_with_no_data(generic_diffsync_model_ro):
+    assert generic_diffsync_model_ro.dict() == {"model_flags": DiffSyncModelFlags.NONE}
 
 
-def test_diffsync_model_json_with_no_data(generic_diffsync_model):
-    assert generic_diffsync_model.json() == "{}"
+def test_diffsync_model_json_with_no_data(generic_diffsync_model_ro):
+    assert generic_diffsync_model_ro.json() == "{}"
 
 
-def test_diffsync_model_str_with_no_data(generic_diffsync_model):
-    assert generic_diffsync_model.str() == "diffsyncmodel: : {}"
+def test_diffsync_model_str_with_no_data(generic_diffsync_model_ro):
+    assert generic_diffsync_model_ro.str() == "diffsyncmodel: : {}"
 
 
 def test_diffsync_model_subclass_getters(make_site, make_device, make_interface):
@@ -91,6 +91,74 @@ def test_diffsync_model_subclass_getters(make_site, make_device, make_interface)
     assert device1_eth0.get_shortname() == "eth0"
 
 
+def test_diffsync_model_unique_id_tracks_identifier_changes(make_interface):
+    intf = make_interface()
+    assert intf.get_unique_id() == "device1__eth0"
+    identity = ("interface", "device1__eth0", "eth0", {"device_name": "device1", "name": "eth0"})
+    assert intf._get_identity() == identity  # pylint: disable=protected-access
+
+    # Changing a non-identifier field has no effect on the unique ID
+    intf.description = "my interface"
+    assert intf.get_unique_id() == "device1__eth0"
+    assert intf._get_identity() == identity  # pylint: disable=protected-access
+
+    # Changing an identifier field must not leave a stale unique ID behind
+    intf.name = "eth1"
+    assert intf.get_unique_id() == "device1__eth1"
+    assert str(intf) == "device1__eth1"
+    identity = ("interface", "device1__eth1", "eth1", {"device_name": "device1", "name": "eth1"})
+    assert intf._get_identity() == identity  # pylint: disable=protected-access
+
+    intf_copy = intf.copy(update={"device_name": "device2"})
+    assert intf_copy.get_unique_id() == "device2__eth1"
+    assert intf.get_unique_id() == "device1__eth1"
+
+
+def test_diffsync_model_unique_id_tracks_property_identifier_changes():
+    class Prefix(DiffSyncModel):
+        _modelname = "prefix"
+        _identifiers = ("cidr",)
+
+        network: str
+        length: int
+
+        @property
+        def cidr(self) -> str:
+            return f"{self.network}/{self.length}"
+
+    prefix = Prefix(network="10.0.0.0", length=8)
+    assert prefix.get_unique_id() == "10.0.0.0/8"
+
+    # The identifier isn't a field itself, so its value can change without it being reassigned
+    prefix.length = 16
+    assert prefix.get_unique_id() == "10.0.0.0/16"
+    identity = ("prefix", "10.0.0.0/16", "10.0.0.0/16", {"cidr": "10.0.0.0/16"})
+    assert prefix._get_identity() == identity  # pylint: disable=protected-access
+    prefix.network = "192.168.0.0"
+    identity = ("prefix", "192.168.0.0/16", "192.168.0.0/16", {"cidr": "192.168.0.0/16"})
+    assert prefix._get_identity() == identity  # pylint: disable=protected-access
+
+
+def test_diffsync_model_get_attrs_nested_values():
+    """Check that container-valued attributes are returned as copies, as with Pydantic's dict()."""
+
+    class Vlan(DiffSyncModel):
+        _modelname = "vlan"
+        _identifiers = ("vid",)
+        _attributes = ("name", "tags")
+
+        vid: int
+        name: str
+        tags: List[str] = []
+
+    vlan = Vlan(vid=10, name="users", tags=["a", "b"])
+    attrs = vlan.get_attrs()
+    assert attrs == {"name": "users", "tags": ["a", "b"]}
+    assert list(attrs.keys()) == ["name", "tags"]
+    attrs["tags"].append("c")
+    assert vlan.tags == ["a", "b"]
+
+
 def test_diffsync_model_dict_with_data(make_interface):
     intf = make_interface()
     # dict() includes all fields, even those set to default values
@@ -158,6 +226,35 @@ def test_diffsync_model_subclass_add_remove(make_site, make_device, make_interfa
         device1.remove_child(device1_eth0)
 
 
+@pytest.mark.parametrize("field_type, storage_type", [(Dict[str, None], dict), (Set[str], set)])
+def test_diffsync_model_add_remove_alternate_child_storage(field_type, storage_type, make_interface):
+    """Check that add_child/remove_child also support children stored in an (ordered) dict or a set."""
+
+    class Switch(DiffSyncModel):
+        _modelname = "switch"
+        _identifiers = ("name",)
+        _children = {"interface": "interfaces"}
+
+        name: str
+        interfaces: field_type = storage_type()  # type: ignore
+
+    switch = Switch(name="device1")
+    intf0 = make_interface()
+    intf1 = make_interface(name="eth1")
+
+    switch.add_child(intf0)
+    switch.add_child(intf1)
+    assert isinstance(switch.interfaces, storage_type)
+    assert sorted(switch.interfaces) == ["device1__eth0", "device1__eth1"]
+    with pytest.raises(ObjectAlreadyExists):
+        switch.add_child(intf0)
+
+    switch.remove_child(intf0)
+    assert list(switch.interfaces) == ["device1__eth1"]
+    with pytest.raises(ObjectNotFound):
+        switch.remove_child(intf0)
+
+
 def test_diffsync_model_dict_with_children(generic_diffsync, make_site, make_device, make_interface):
     site1 = make_site(diffsync=generic_diffsync)
     device1 = make_device(diffsync=generic_diffsync)
@@ -214,6 +311,32 @@ site: site1: {}
     )
 
 
+def test_diffsync_model_str_with_custom_child_str(generic_diffsync, make_site):
+    """Test that a child model whose class overrides str() is rendered that way in its parent's str()."""
+
+    class TerseDevice(Device):
+        """Device with a one-line string representation."""
+
+        def str(self, include_children: bool = True, indent: int = 0) -> str:
+            """Summarize this device in a single line."""
+            return f"{' ' * indent}{self.name} ({self.role})"
+
+    site1 = make_site(diffsync=generic_diffsync)
+    device1 = TerseDevice(name="device1", site_name="site1", role="spine", diffsync=generic_diffsync)
+    site1.add_child(device1)
+    generic_diffsync.add(site1)
+    generic_diffsync.add(device1)
+
+    assert (
+        site1.str()
+        == """\
+site: site1: {}
+  devices
+    device1 (spine)\
+"""
+    )
+
+
 def test_diffsync_model_subclass_crud(generic_diffsync):
     """Test basic CRUD operations on generic DiffSyncModel subclasses."""
     device1 = Device.create(generic_diffsync, {"name": "device1"}, {"role": "spine"})
@@ -385,3 +508,37 @@ def test_diffsync_model_subclass_inheritance():
     beta = Beta(name="Beta", letter="β", nombre="Beta", letra="β")
     assert beta.get_unique_id() == "Beta__Beta"
     assert beta.get_attrs() == {"letter": "β", "letra": "β"}
+
+
+def test_diffsync_model_subclass_modelname_str_subclass():
+    """Verify that a str subclass is still accepted as a _modelname, even though it can't be interned."""
+
+    class ModelName(str):
+        """A str subclass."""
+
+    class Gamma(DiffSyncModel):
+        """A model class whose modelname is a str subclass."""
+
+        _modelname = ModelName("gamma")
+        _identifiers = ("name",)
+
+        name: str
+
+    assert Gamma.get_type() == "gamma"
+    assert isinstance(Gamma.get_type(), ModelName)
+
+
+def test_diffsync_model_nested_model_field_is_not_copied(make_device):
+    """Check that a model instance used as a field value of another model is stored as-is, not copied."""
+
+    class DeviceRef(DiffSyncModel):
+        _modelname = "deviceref"
+        _identifiers = ("name",)
+        _attributes = ("device",)
+
+        name: str
+        device: Device
+
+    device1 = make_device()
+    ref = DeviceRef(name="ref1", device=device1)
+    assert ref.device is device1
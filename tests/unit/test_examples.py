@@ -18,6 +18,11 @@ limitations under the License.
 from os.path import join, dirname
 import subprocess
 
+import pytest
+
+# Each of these tests launches a separate Python interpreter to run an example script
+pytestmark = pytest.mark.slow
+
 EXAMPLES = join(dirname(dirname(dirname(__file__))), "examples")
 
 